@@ -1,9 +1,29 @@
 """ico-to-svg: Convert Windows ICO files to SVG."""
 
-__all__ = ["convert_ico_to_svg", "load_ico_frames", "main"]
+from typing import TYPE_CHECKING, Any
 
+__all__ = [
+    "VectorFallbackWarning",
+    "convert_ico_to_svg",
+    "convert_ico_to_svg_batch",
+    "load_ico_frames",
+    "main",
+]
+
+from ._fallback import VectorFallbackWarning
 from .cli import main
-from .core import convert_ico_to_svg
 from .ico_parser import load_ico_frames
 
+if TYPE_CHECKING:
+    from .core import convert_ico_to_svg, convert_ico_to_svg_batch
+
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    # The conversion API pulls in NumPy; defer it so `ico-to-svg info` stays light.
+    if name in {"convert_ico_to_svg", "convert_ico_to_svg_batch"}:
+        from . import core
+
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,12 @@
+"""Vector-to-raster fallback policy, shared by the API and the CLI.
+
+Kept free of NumPy so the CLI can read it without importing the converter.
+"""
+
+# Above this many distinct opaque colors an icon is treated as photographic:
+# vector mode would emit roughly one rect per pixel, so raster is used instead.
+VECTOR_MAX_COLORS = 256
+
+
+class VectorFallbackWarning(RuntimeWarning):
+    """Vector mode was requested but the icon was written in raster mode."""
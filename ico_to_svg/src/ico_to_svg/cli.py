@@ -3,8 +3,9 @@
 import argparse
 import json
 import sys
+import warnings
 
-from .core import convert_ico_to_svg
+from ._fallback import VECTOR_MAX_COLORS, VectorFallbackWarning
 from .ico_parser import load_ico_frames, parse_size_arg, select_size
 
 
@@ -61,6 +62,19 @@ def main(argv: list[str] | None = None) -> None:
         help='Background color (CSS color) or "transparent" (default: transparent)',
     )
     p_conv.add_argument("--size", help="Desired icon size (e.g., 256 or 256x256)")
+    p_conv.add_argument(
+        "--embed",
+        choices=["base64", "sidecar"],
+        default="base64",
+        help="Raster mode: inline PNG as base64, or write a sidecar .png and link it "
+        "(default: base64)",
+    )
+    p_conv.add_argument(
+        "--force-vector",
+        action="store_true",
+        help="Vector mode: do not fall back to raster for photographic icons "
+        f"(more than {VECTOR_MAX_COLORS} colors)",
+    )
 
     # info subcommand
     p_info = sub.add_parser("info", help="List available sizes in an ICO")
@@ -71,15 +85,33 @@ def main(argv: list[str] | None = None) -> None:
     args = parser.parse_args(argv)
 
     if args.cmd == "convert":
-        convert_ico_to_svg(
-            input_path=args.input,
-            output_path=args.output,
-            mode=args.mode,
-            alpha_threshold=args.alpha_threshold,
-            background=args.background,
-            size=args.size,
-        )
-        print(f"Wrote {args.output} ({args.mode} mode)")
+        # Imported here so the info command does not pay for NumPy at startup.
+        from .core import convert_ico_to_svg
+
+        # Report the raster fallback as a plain stderr line rather than a
+        # traceback pointing into this module; other warnings are shown as usual.
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", VectorFallbackWarning)
+            used_mode = convert_ico_to_svg(
+                input_path=args.input,
+                output_path=args.output,
+                mode=args.mode,
+                alpha_threshold=args.alpha_threshold,
+                background=args.background,
+                size=args.size,
+                embed=args.embed,
+                force_vector=args.force_vector,
+            )
+        for warning in caught:
+            if issubclass(warning.category, VectorFallbackWarning):
+                print(f"warning: {warning.message}", file=sys.stderr)
+            else:
+                warnings.showwarning(
+                    warning.message, warning.category, warning.filename, warning.lineno
+                )
+        if used_mode != args.mode:
+            print("Pass --force-vector to keep vector output.", file=sys.stderr)
+        print(f"Wrote {args.output} ({used_mode} mode)")
         return
 
     # info subcommand
@@ -89,16 +121,14 @@ def main(argv: list[str] | None = None) -> None:
         selected = select_size(sizes, desired)
         sizes = [selected]
 
+    # load_ico_frames already returns sizes smallest first.
     if args.json:
-        out = [
-            {"width": int(w), "height": int(h)}
-            for (w, h) in sorted(sizes, key=lambda s: (s[0] * s[1], s[0], s[1]))
-        ]
+        out = [{"width": int(w), "height": int(h)} for (w, h) in sizes]
         print(json.dumps(out, ensure_ascii=False))
     else:
         if not sizes:
             print("No sizes found")
         else:
             print("Available sizes:")
-            for w, h in sorted(sizes, key=lambda s: (s[0] * s[1], s[0], s[1])):
+            for w, h in sizes:
                 print(f" - {w}x{h}")
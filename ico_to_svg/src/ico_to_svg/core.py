@@ -1,9 +1,38 @@
 """Core conversion API orchestrating ICO parsing and SVG generation."""
 
+import warnings
+from collections.abc import Iterable
 from pathlib import Path
 
+from PIL import Image
+
+from ._fallback import VECTOR_MAX_COLORS, VectorFallbackWarning
 from .ico_parser import load_ico_frames, open_ico_at_size, parse_size_arg, select_size
-from .svg_writer import vectorize, write_svg_raster, write_svg_vector
+from .svg_writer import (
+    RasterEmbed,
+    count_opaque_colors,
+    vectorize,
+    write_svg_raster,
+    write_svg_vector,
+)
+
+
+def _resolve_mode(
+    image: Image.Image, mode: str, alpha_threshold: int, force_vector: bool, stacklevel: int
+) -> str:
+    """Return the mode to render with, falling back to raster for photographic icons."""
+    if mode != "vector" or force_vector:
+        return mode
+    n_colors = count_opaque_colors(image, alpha_threshold)
+    if n_colors <= VECTOR_MAX_COLORS:
+        return mode
+    warnings.warn(
+        f"Image has {n_colors} colors (> {VECTOR_MAX_COLORS}); vector output would be "
+        "excessively large, using raster mode instead.",
+        VectorFallbackWarning,
+        stacklevel=stacklevel + 1,
+    )
+    return "raster"
 
 
 def convert_ico_to_svg(
@@ -13,7 +42,10 @@ def convert_ico_to_svg(
     alpha_threshold: int = 16,
     background: str | None = "transparent",
     size: str | None = None,
-) -> None:
+    compress_level: int = 1,
+    embed: RasterEmbed = "base64",
+    force_vector: bool = False,
+) -> str:
     """Convert an ICO file to SVG.
 
     Parameters
@@ -32,13 +64,34 @@ def convert_ico_to_svg(
         CSS color for background, or "transparent". Default is "transparent".
     size : str or None, optional
         Desired size like "256" or "256x256". If None, uses largest available.
+    compress_level : int, optional
+        Raster mode: zlib compression level (0-9) for the embedded PNG.
+        Default is 1 (fast).
+    embed : {"base64", "sidecar"}, optional
+        Raster mode: inline the PNG as a base64 data URI, or write it next to
+        the SVG with a ``.png`` suffix and link it. Default is "base64".
+    force_vector : bool, optional
+        Vector mode: keep vector output even for icons with more than
+        ``VECTOR_MAX_COLORS`` distinct colors. Default is False.
+
+    Returns
+    -------
+    str
+        The mode actually used, "raster" or "vector".
 
     Raises
     ------
     FileNotFoundError
         If input_path does not exist.
     ValueError
-        If size format is invalid or ICO has no frames.
+        If size format is invalid, ICO has no frames, compress_level is
+        outside 0-9, or embed is unknown.
+
+    Warns
+    -----
+    VectorFallbackWarning
+        If vector mode was requested for a photographic icon and raster mode
+        was used instead (pass ``force_vector=True`` to prevent this).
 
     Examples
     --------
@@ -50,12 +103,106 @@ def convert_ico_to_svg(
     desired = parse_size_arg(size) if size else None
     selected = select_size(sizes, desired)
     img = open_ico_at_size(input_path, selected)
+    mode = _resolve_mode(img, mode, alpha_threshold, force_vector, stacklevel=2)
 
     if mode == "raster":
-        write_svg_raster(img, output_path, background)
+        write_svg_raster(img, output_path, background, compress_level=compress_level, embed=embed)
     else:
         color_runs, w, h = vectorize(img, alpha_threshold)
         write_svg_vector(color_runs, w, h, output_path, background)
+    return mode
+
+
+def convert_ico_to_svg_batch(
+    input_path: Path | str,
+    outputs: Iterable[tuple[str | None, Path | str, str]],
+    alpha_threshold: int = 16,
+    background: str | None = "transparent",
+    compress_level: int = 1,
+    embed: RasterEmbed = "base64",
+    force_vector: bool = False,
+) -> None:
+    """Convert one ICO file to several SVGs, decoding each frame at most once.
+
+    Parameters
+    ----------
+    input_path : Path or str
+        Input ICO file path.
+    outputs : Iterable[Tuple[str or None, Path or str, str]]
+        ``(size, output_path, mode)`` requests. ``size`` and ``mode`` take the
+        same values as in convert_ico_to_svg().
+    alpha_threshold : int, optional
+        Minimum alpha (0-255) to treat pixel as opaque in vector mode.
+        Default is 16.
+    background : str or None, optional
+        CSS color for background, or "transparent". Default is "transparent".
+    compress_level : int, optional
+        Raster mode: zlib compression level (0-9). Default is 1.
+    embed : {"base64", "sidecar"}, optional
+        Raster mode PNG embedding. Default is "base64".
+    force_vector : bool, optional
+        Keep vector output for photographic icons. Default is False.
+
+    Raises
+    ------
+    FileNotFoundError
+        If input_path does not exist.
+    ValueError
+        If a size format is invalid or ICO has no frames.
+
+    Warns
+    -----
+    VectorFallbackWarning
+        For each frame where vector requests fall back to raster mode.
+
+    Notes
+    -----
+    The ICO directory is parsed once. Requests are grouped by the frame that
+    size selection resolves to, so requests that map to the same frame share
+    one decode, and vector requests on that frame share one vectorize() pass.
+
+    Examples
+    --------
+    >>> convert_ico_to_svg_batch(
+    ...     "icon.ico",
+    ...     [
+    ...         ("16", "icon16.svg", "raster"),
+    ...         ("32", "icon32.svg", "vector"),
+    ...         (None, "icon.svg", "raster"),
+    ...     ],
+    ... )
+    """
+    sizes = load_ico_frames(input_path)
+    by_frame: dict[tuple[int, int], list[tuple[Path | str, str]]] = {}
+    for size, output_path, mode in outputs:
+        desired = parse_size_arg(size) if size else None
+        by_frame.setdefault(select_size(sizes, desired), []).append((output_path, mode))
+
+    for selected, requests in by_frame.items():
+        img = open_ico_at_size(input_path, selected)
+        vectorized = None
+        vector_mode: str | None = None
+        for output_path, mode in requests:
+            if mode == "vector":
+                if vector_mode is None:
+                    vector_mode = _resolve_mode(
+                        img, mode, alpha_threshold, force_vector, stacklevel=2
+                    )
+                mode = vector_mode
+            if mode == "raster":
+                write_svg_raster(
+                    img, output_path, background, compress_level=compress_level, embed=embed
+                )
+            else:
+                if vectorized is None:
+                    vectorized = vectorize(img, alpha_threshold)
+                color_runs, w, h = vectorized
+                write_svg_vector(color_runs, w, h, output_path, background)
 
 
-__all__ = ["convert_ico_to_svg"]
+__all__ = [
+    "VECTOR_MAX_COLORS",
+    "VectorFallbackWarning",
+    "convert_ico_to_svg",
+    "convert_ico_to_svg_batch",
+]
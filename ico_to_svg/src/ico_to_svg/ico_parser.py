@@ -1,10 +1,14 @@
 """ICO file parsing and size selection logic."""
 
+import functools
+import os
+from collections.abc import Collection
 from pathlib import Path
 
 from PIL import Image
 
 
+@functools.lru_cache(maxsize=256)
 def parse_size_arg(size_str: str) -> tuple[int, int]:
     """Parse size argument like '256' or '256x256'.
 
@@ -23,6 +27,11 @@ def parse_size_arg(size_str: str) -> tuple[int, int]:
     ValueError
         If format is invalid or dimensions are non-positive.
 
+    Notes
+    -----
+    Results are memoized per string; invalid inputs are not cached and raise
+    on every call.
+
     Examples
     --------
     >>> parse_size_arg("256")
@@ -54,7 +63,8 @@ def load_ico_frames(path: Path | str) -> list[tuple[int, int]]:
     Returns
     -------
     List[Tuple[int, int]]
-        List of unique (width, height) tuples available in the ICO.
+        List of unique (width, height) tuples available in the ICO, sorted
+        by area, then width, then height (smallest first).
 
     Raises
     ------
@@ -66,30 +76,45 @@ def load_ico_frames(path: Path | str) -> list[tuple[int, int]]:
     Notes
     -----
     Uses PIL's im.info['sizes'] when available, otherwise iterates
-    through frames to determine sizes.
+    through frames to determine sizes. Neither source preserves the ICO
+    directory order (PIL reports sizes as a set), hence the explicit sort.
+    Results are cached per path and re-read automatically when the file's
+    modification time or size changes.
 
     Examples
     --------
     >>> load_ico_frames("icon.ico")
     [(16, 16), (32, 32), (64, 64), (128, 128)]
     """
-    im = Image.open(str(path))
-    sizes = im.info.get("sizes")
-    if sizes:
-        return list({(int(w), int(h)) for (w, h) in sizes})
-    # Fallback: iterate frames if available
-    frames = []
-    n = getattr(im, "n_frames", 1)
-    for i in range(n):
-        if n > 1:
-            im.seek(i)
-        frames.append((im.width, im.height))
-    # Unique them
-    return list({(int(w), int(h)) for (w, h) in frames})
+    key = str(path)
+    return list(_cached_sizes(key, _file_stamp(key)))
+
+
+def _file_stamp(path: str) -> tuple[int, int]:
+    """Return (mtime_ns, size) for path; part of the cache key so edits invalidate it."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_sizes(path: str, _stamp: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+    """Read the frame sizes of an ICO; cached per path and file stamp."""
+    with Image.open(path) as im:
+        frames = im.info.get("sizes")
+        if not frames:
+            # Fallback: iterate frames if available
+            frames = []
+            n = getattr(im, "n_frames", 1)
+            for i in range(n):
+                if n > 1:
+                    im.seek(i)
+                frames.append((im.width, im.height))
+    unique = {(int(w), int(h)) for (w, h) in frames}
+    return tuple(sorted(unique, key=lambda s: (s[0] * s[1], s[0], s[1])))
 
 
 def select_size(
-    available: list[tuple[int, int]], desired: tuple[int, int] | None
+    available: Collection[tuple[int, int]], desired: tuple[int, int] | None
 ) -> tuple[int, int]:
     """Select ICO frame size using priority rules.
 
@@ -100,8 +125,9 @@ def select_size(
 
     Parameters
     ----------
-    available : List[Tuple[int, int]]
-        Available (width, height) sizes in the ICO.
+    available : Collection[Tuple[int, int]]
+        Available (width, height) sizes in the ICO. Results are memoized per
+        distinct set of sizes and desired size.
     desired : Tuple[int, int] or None
         Desired (width, height), or None for largest.
 
@@ -126,25 +152,28 @@ def select_size(
     """
     if not available:
         raise ValueError("No sizes available in ICO")
+    return _select_size_cached(frozenset(available), desired)
 
-    # Largest by area default
-    largest = max(available, key=lambda s: (s[0] * s[1], s[0], s[1]))
-    if not desired:
-        return largest
 
-    dw, dh = desired
-    # Exact match
-    if (dw, dh) in available:
-        return (dw, dh)
+@functools.lru_cache(maxsize=256)
+def _select_size_cached(
+    available: frozenset[tuple[int, int]], desired: tuple[int, int] | None
+) -> tuple[int, int]:
+    """select_size() on a hashable size set; the rules do not depend on order."""
+    if desired:
+        dw, dh = desired
+        # Exact match
+        if (dw, dh) in available:
+            return (dw, dh)
 
-    # Nearest larger candidates (both dimensions >= requested)
-    larger = [(w, h) for (w, h) in available if w >= dw and h >= dh]
-    if larger:
-        # Prefer square (min |w-h|), then lowest area, then smallest width
-        return min(larger, key=lambda s: (abs(s[0] - s[1]), s[0] * s[1], s[0], s[1]))
+        # Nearest larger candidates (both dimensions >= requested)
+        larger = [(w, h) for (w, h) in available if w >= dw and h >= dh]
+        if larger:
+            # Prefer square (min |w-h|), then lowest area, then smallest width
+            return min(larger, key=lambda s: (abs(s[0] - s[1]), s[0] * s[1], s[0], s[1]))
 
-    # Else largest
-    return largest
+    # Else largest by area
+    return max(available, key=lambda s: (s[0] * s[1], s[0], s[1]))
 
 
 def open_ico_at_size(path: Path | str, size: tuple[int, int]) -> Image.Image:
@@ -165,7 +194,9 @@ def open_ico_at_size(path: Path | str, size: tuple[int, int]) -> Image.Image:
     Notes
     -----
     Uses PIL's low-level ICO API to load specific size.
-    Always returns RGBA mode for consistent processing.
+    Always returns RGBA mode for consistent processing. Decoded pixels are
+    cached as raw bytes per (path, modification stamp, size), and a new Image
+    is built from them on each call, so callers may modify the result freely.
 
     Examples
     --------
@@ -175,18 +206,25 @@ def open_ico_at_size(path: Path | str, size: tuple[int, int]) -> Image.Image:
     >>> img.mode
     'RGBA'
     """
+    key = str(path)
+    im_size, data = _cached_image_bytes(key, _file_stamp(key), (size[0], size[1]))
+    return Image.frombytes("RGBA", im_size, data)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_image_bytes(
+    path: str, _stamp: tuple[int, int], size: tuple[int, int]
+) -> tuple[tuple[int, int], bytes]:
+    """Decode one ICO frame to raw RGBA bytes; cached like _cached_sizes."""
     from PIL import IcoImagePlugin
 
-    with open(str(path), "rb") as f:
+    with open(path, "rb") as f:
         ico_file = IcoImagePlugin.IcoFile(f)
 
-        # Find entry matching requested size
-        for i, entry in enumerate(ico_file.entry):
-            if entry.dim == size:
-                # Load the specific entry
-                im = ico_file.frame(i)
-                return im.convert("RGBA")
-
-        # If exact match not found, load largest (first entry)
-        im = ico_file.frame(0)
-        return im.convert("RGBA")
+        # Find entry matching requested size; if not found, load largest (first entry)
+        index = next((i for i, entry in enumerate(ico_file.entry) if entry.dim == size), 0)
+        im = ico_file.frame(index)
+        # The ICO decoder usually yields RGBA already; only convert when needed.
+        if im.mode != "RGBA":
+            im = im.convert("RGBA")
+        return im.size, im.tobytes()
@@ -1,18 +1,47 @@
 """SVG generation for raster and vector modes."""
 
 import base64
+import contextlib
+import hashlib
 import io
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal, TextIO, overload
+from urllib.parse import quote
+from xml.sax.saxutils import quoteattr
 
-import svgwrite
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageColor
 
+# Packed value for pixels below the alpha threshold; real colors fit in 24 bits.
+_TRANSPARENT = np.uint32(0xFFFFFFFF)
+_RGBA_LE = np.dtype("<u4")
 
-@dataclass
+# PNG encodes of recent raster renders, keyed by a content hash.
+_PNG_CACHE_SIZE = 64
+_png_cache: OrderedDict[bytes, bytes] = OrderedDict()
+_png_cache_lock = threading.Lock()
+_B64_CHUNK = 3 * 4096
+
+# Path commands for one run: M x1,y H x2+1 V y+1 H x1 Z
+_RECT_CMD = "M%d,%dH%dV%dH%dZ"
+
+# Pre-rendered decimal strings for path coordinates. ICO frames are at most
+# 256x256, so every coordinate of an icon fits; larger images fall back to
+# _RECT_CMD formatting.
+_DIGITS = tuple(str(i) for i in range(513))
+
+
+@dataclass(slots=True)
 class Run:
     """Horizontal run of pixels with same color.
 
+    Slotted, so instances carry no per-object ``__dict__``.
+
     Attributes
     ----------
     y : int
@@ -28,9 +57,110 @@ class Run:
     x2: int  # inclusive end
 
 
+@dataclass(frozen=True, eq=False)
+class RunArrays(Sequence[Run]):
+    """Horizontal runs of one color stored as one compact integer array.
+
+    Attributes
+    ----------
+    cols : np.ndarray
+        Array of shape (N, 3) holding ``(y, x1, x2)`` per run, with x2
+        inclusive. int16 when every coordinate fits (always true for ICO
+        frames), otherwise int32.
+
+    Notes
+    -----
+    ``y``, ``x1`` and ``x2`` are column views into ``cols``. A read-only
+    ``Sequence[Run]``: indexing and iteration create Run objects lazily for
+    callers that expect the list-based representation, and slicing returns
+    another RunArrays over a view of the same array. Two instances compare
+    equal when they hold the same runs, whatever their integer dtype.
+
+    Examples
+    --------
+    >>> runs = RunArrays.from_runs([Run(0, 0, 3), Run(1, 2, 5)])
+    >>> runs[-1]
+    Run(y=1, x1=2, x2=5)
+    >>> runs[:1] == RunArrays.from_runs([Run(0, 0, 3)])
+    True
+    """
+
+    cols: np.ndarray
+
+    @property
+    def y(self) -> np.ndarray:
+        """Row index of each run."""
+        return self.cols[:, 0]
+
+    @property
+    def x1(self) -> np.ndarray:
+        """Starting column of each run (inclusive)."""
+        return self.cols[:, 1]
+
+    @property
+    def x2(self) -> np.ndarray:
+        """Ending column of each run (inclusive)."""
+        return self.cols[:, 2]
+
+    def __len__(self) -> int:
+        return len(self.cols)
+
+    @overload
+    def __getitem__(self, index: int) -> Run: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "RunArrays": ...
+
+    def __getitem__(self, index: int | slice) -> "Run | RunArrays":
+        if isinstance(index, slice):
+            return RunArrays(self.cols[index])
+        # tolist() yields Python ints, so Run fields never carry int16 overflow.
+        y, x1, x2 = self.cols[index].tolist()
+        return Run(y, x1, x2)
+
+    def __iter__(self) -> Iterator[Run]:
+        for y, x1, x2 in self.cols.tolist():
+            yield Run(y, x1, x2)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RunArrays):
+            return NotImplemented
+        return bool(np.array_equal(self.cols, other.cols))
+
+    @classmethod
+    def from_runs(cls, runs: Iterable[Run]) -> "RunArrays":
+        """Build the run array from Run objects."""
+        cols = np.array([(run.y, run.x1, run.x2) for run in runs], dtype=np.int64)
+        return cls(_compact_coords(cols.reshape(-1, 3)))
+
+
+def _compact_coords(cols: np.ndarray) -> np.ndarray:
+    """Cast run coordinates to int16 when they (and coordinate + 1) fit, else int32."""
+    i16 = np.iinfo(np.int16)
+    if len(cols) == 0 or (int(cols.min()) >= i16.min and int(cols.max()) < i16.max):
+        return cols.astype(np.int16)
+    return cols.astype(np.int32)
+
+
+RasterEmbed = Literal["base64", "sidecar"]
+
+ColorRuns = Mapping[tuple[int, int, int, int], Sequence[Run] | RunArrays]
+
+SvgOutput = Path | str | TextIO
+
+
+def _open_output(
+    output: SvgOutput, buffering: int = -1
+) -> contextlib.AbstractContextManager[TextIO]:
+    """Open a path for writing, or pass an already-open text stream through unclosed."""
+    if isinstance(output, (str, os.PathLike)):
+        return open(output, "w", encoding="utf-8", buffering=buffering)
+    return contextlib.nullcontext(output)
+
+
 def vectorize(
     image: Image.Image, alpha_threshold: int
-) -> tuple[dict[tuple[int, int, int, int], list[Run]], int, int]:
+) -> tuple[dict[tuple[int, int, int, int], RunArrays], int, int]:
     """Vectorize an image into horizontal runs grouped by color.
 
     Parameters
@@ -42,8 +172,8 @@ def vectorize(
 
     Returns
     -------
-    color_runs : Dict[Tuple[int, int, int, int], List[Run]]
-        Dictionary mapping (R, G, B, 255) tuples to lists of Run objects.
+    color_runs : Dict[Tuple[int, int, int, int], RunArrays]
+        Dictionary mapping (R, G, B, 255) tuples to the runs of that color.
     width : int
         Image width.
     height : int
@@ -52,7 +182,10 @@ def vectorize(
     Notes
     -----
     Pixels with alpha below threshold are treated as transparent (skipped).
-    All opaque pixels are normalized to alpha=255.
+    All opaque pixels are normalized to alpha=255. Run boundaries are found
+    with vectorized NumPy comparisons over the whole RGBA buffer rather than
+    per-pixel access, and grouped by color with ``np.unique`` so no per-run
+    Python objects are created. Colors keep their first-seen (row-major) order.
 
     Examples
     --------
@@ -64,45 +197,113 @@ def vectorize(
     1
     """
     w, h = image.size
-    pixels = image.load()
-    if pixels is None:
-        raise ValueError("Failed to load image pixels")
-
-    color_runs: dict[tuple[int, int, int, int], list[Run]] = {}
-    for y in range(h):
-        x = 0
-        while x < w:
-            pixel = pixels[x, y]
-            if not isinstance(pixel, tuple) or len(pixel) < 4:
-                x += 1
-                continue
-            r, g, b, a = int(pixel[0]), int(pixel[1]), int(pixel[2]), int(pixel[3])
-            if a < alpha_threshold:
-                x += 1
-                continue
-            color = (r, g, b, 255)
-            x_start = x
-            x += 1
-            while x < w:
-                pixel2 = pixels[x, y]
-                if not isinstance(pixel2, tuple) or len(pixel2) < 4:
-                    break
-                r2, g2, b2, a2 = int(pixel2[0]), int(pixel2[1]), int(pixel2[2]), int(pixel2[3])
-                if a2 < alpha_threshold or (r2, g2, b2) != (r, g, b):
-                    break
-                x += 1
-            x_end = x - 1
-            color_runs.setdefault(color, []).append(Run(y, x_start, x_end))
-    return color_runs, w, h
-
-
-def runs_to_path_d(runs: list[Run]) -> str:
+    if w == 0 or h == 0:
+        return {}, w, h
+
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    arr = np.ascontiguousarray(np.asarray(image))
+    ys, x1s, x2s, colors = _find_runs_numpy(arr, alpha_threshold)
+    return _group_runs(ys, x1s, x2s, colors), w, h
+
+
+def count_opaque_colors(image: Image.Image, alpha_threshold: int) -> int:
+    """Count the distinct RGB colors vector mode would emit paths for.
+
+    Parameters
+    ----------
+    image : Image.Image
+        PIL Image (converted to RGBA if needed).
+    alpha_threshold : int
+        Minimum alpha value (0-255) to consider pixel opaque.
+
+    Returns
+    -------
+    int
+        Number of unique RGB values among pixels with alpha >= threshold.
+
+    Examples
+    --------
+    >>> count_opaque_colors(Image.new("RGBA", (4, 4), (255, 0, 0, 255)), 16)
+    1
+    """
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    rgba = np.ascontiguousarray(np.asarray(image)).view(_RGBA_LE).ravel()
+    opaque = rgba[rgba >= (alpha_threshold << 24)]
+    return int(np.unique(opaque & np.uint32(0x00FFFFFF)).size)
+
+
+def _find_runs_numpy(
+    arr: np.ndarray, alpha_threshold: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Find opaque runs in an (H, W, 4) uint8 array with whole-array NumPy ops.
+
+    Returns row, start column, end column (inclusive) and packed 0xRRGGBB color
+    of every run in row-major order, as int32/int32/int32/uint32 arrays.
+
+    ``arr`` must be non-empty and C-contiguous. Each pixel's four bytes are
+    reinterpreted as one little-endian uint32 (0xAABBGGRR) without copying;
+    the explicit ``<u4`` dtype keeps that layout correct on big-endian hosts
+    too.
+    """
+    h, w = arr.shape[:2]
+    rgba = arr.view(_RGBA_LE).ravel()
+    transparent = rgba < (alpha_threshold << 24)
+    packed = rgba & np.uint32(0x00FFFFFF)
+    packed[transparent] = _TRANSPARENT
+
+    # Scan the image as one flat word stream: a run starts wherever the packed
+    # value differs from the previous pixel's, or at the start of a row, and
+    # ends just before the next run starts.
+    breaks = np.empty(h * w, dtype=bool)
+    np.not_equal(packed[1:], packed[:-1], out=breaks[1:])
+    breaks[::w] = True
+    starts = np.flatnonzero(breaks)
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = h * w - 1
+
+    colors = packed[starts]
+    keep = colors != _TRANSPARENT
+    ys, x1s = np.divmod(starts[keep], w)
+    x2s = ends[keep] - ys * w
+    bgr = colors[keep]
+    # Swap 0xBBGGRR to 0xRRGGBB on the (much shorter) run array only.
+    rgb = ((bgr & 0xFF) << 16) | (bgr & 0xFF00) | (bgr >> 16)
+    return ys.astype(np.int32), x1s.astype(np.int32), x2s.astype(np.int32), rgb
+
+
+def _group_runs(
+    ys: np.ndarray, x1s: np.ndarray, x2s: np.ndarray, colors: np.ndarray
+) -> dict[tuple[int, int, int, int], RunArrays]:
+    """Group row-major run arrays by packed color, in first-seen color order."""
+    color_runs: dict[tuple[int, int, int, int], RunArrays] = {}
+    if len(colors) == 0:
+        return color_runs
+
+    # Sort runs by color (stable, so each group stays in row-major order) and
+    # slice each group's rows out of one sorted (N, 3) coordinate array.
+    uniq, first, inverse = np.unique(colors, return_index=True, return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(uniq) + 1)).tolist()
+    cols = _compact_coords(np.column_stack((ys, x1s, x2s))[order])
+    packed_colors = uniq.tolist()
+    for i in np.argsort(first).tolist():
+        lo, hi = bounds[i], bounds[i + 1]
+        c = packed_colors[i]
+        color = (c >> 16, (c >> 8) & 0xFF, c & 0xFF, 255)
+        color_runs[color] = RunArrays(cols[lo:hi])
+    return color_runs
+
+
+def runs_to_path_d(runs: Sequence[Run] | RunArrays) -> str:
     """Convert runs into SVG path data string.
 
     Parameters
     ----------
-    runs : List[Run]
-        List of horizontal runs.
+    runs : Sequence[Run] or RunArrays
+        Horizontal runs, as Run objects or column arrays.
 
     Returns
     -------
@@ -111,7 +312,13 @@ def runs_to_path_d(runs: list[Run]) -> str:
 
     Notes
     -----
-    Each run becomes a rectangle: M x,y H x2 V y+1 H x Z
+    Each run becomes a rectangle: M x,y H x2 V y+1 H x Z. Coordinates in
+    0-512 (every ICO frame) are looked up in a table of pre-rendered strings,
+    so no integer formatting happens per run; larger images interleave all
+    coordinates in one NumPy pass and render them with a single ``%`` format.
+    Assembling the commands with ``np.char`` string ufuncs is 3-4x slower
+    than either path, because every step copies through fixed-width unicode
+    arrays.
 
     Examples
     --------
@@ -119,95 +326,216 @@ def runs_to_path_d(runs: list[Run]) -> str:
     >>> runs_to_path_d(runs)
     'M0,0H4V1H0Z M0,1H4V2H0Z'
     """
-    parts = []
-    for run in runs:
-        x1 = run.x1
-        x2 = run.x2 + 1  # exclusive for H command
-        y = run.y
-        parts.append(f"M{x1},{y}H{x2}V{y + 1}H{x1}Z")
-    return " ".join(parts)
+    if not isinstance(runs, RunArrays):
+        runs = RunArrays.from_runs(runs)
+    n = len(runs)
+    if n == 0:
+        return ""
+    # x2 + 1: exclusive end for H command
+    x2_end = runs.x2 + 1
+    lo = min(int(runs.x1.min()), int(runs.y.min()), int(x2_end.min()))
+    if lo >= 0 and max(int(x2_end.max()), int(runs.y.max()) + 1) < len(_DIGITS):
+        d = _DIGITS
+        return " ".join(
+            [
+                f"M{d[x1]},{d[y]}H{d[x2]}V{d[y + 1]}H{d[x1]}Z"
+                for y, x1, x2 in zip(
+                    runs.y.tolist(), runs.x1.tolist(), x2_end.tolist(), strict=True
+                )
+            ]
+        )
+    coords = np.column_stack((runs.x1, runs.y, x2_end, runs.y + 1, runs.x1))
+    return " ".join([_RECT_CMD] * n) % tuple(coords.ravel().tolist())
 
 
 def write_svg_vector(
-    color_runs: dict[tuple[int, int, int, int], list[Run]],
+    color_runs: ColorRuns,
     width: int,
     height: int,
-    output: Path | str,
+    output: SvgOutput,
     background: str | None = None,
 ) -> None:
     """Write vectorized SVG with rectangle paths.
 
     Parameters
     ----------
-    color_runs : Dict[Tuple[int, int, int, int], List[Run]]
+    color_runs : Mapping[Tuple[int, int, int, int], Sequence[Run] or RunArrays]
         Color-keyed runs from vectorize().
     width : int
         Canvas width.
     height : int
         Canvas height.
-    output : Path or str
-        Output SVG file path.
+    output : Path, str or TextIO
+        Output SVG file path, or an open text stream (e.g. ``io.StringIO``)
+        which is written to but not closed.
     background : str or None, optional
         CSS color for background, or "transparent".
 
     Notes
     -----
     Creates one path element per color, each containing all runs of that color.
+    The document is streamed straight to the file as it is generated rather
+    than built as an element tree first.
 
     Examples
     --------
     >>> runs = {(255, 0, 0, 255): [Run(0, 0, 3)]}
     >>> write_svg_vector(runs, 4, 1, "out.svg")
     """
-    dwg = svgwrite.Drawing(
-        str(output), size=(f"{width}px", f"{height}px"), viewBox=f"0 0 {width} {height}"
-    )
-    if background and background != "transparent":
-        dwg.add(dwg.rect(insert=(0, 0), size=(width, height), fill=background))
-    for (r, g, b, _a), runs in color_runs.items():
-        fill = f"#{r:02x}{g:02x}{b:02x}"
-        d = runs_to_path_d(runs)
-        dwg.add(dwg.path(d=d, fill=fill, stroke="none"))
-    dwg.save()
+    with _open_output(output, buffering=1 << 20) as f:
+        f.write(
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}px" height="{height}px" '
+            f'viewBox="0 0 {width} {height}">\n'
+        )
+        if background and background != "transparent":
+            f.write(
+                f'<rect x="0" y="0" width="{width}" height="{height}" '
+                f"fill={quoteattr(background)} />\n"
+            )
+        for (r, g, b, _a), runs in color_runs.items():
+            f.write(f'<path fill="#{r:02x}{g:02x}{b:02x}" stroke="none" d="')
+            f.write(runs_to_path_d(runs))
+            f.write('" />\n')
+        f.write("</svg>\n")
 
 
-def write_svg_raster(image: Image.Image, output: Path | str, background: str | None = None) -> None:
-    """Write raster SVG with base64-embedded PNG.
+def write_svg_raster(
+    image: Image.Image,
+    output: SvgOutput,
+    background: str | None = None,
+    compress_level: int = 1,
+    embed: RasterEmbed = "base64",
+) -> None:
+    """Write raster SVG with an embedded or linked PNG.
 
     Parameters
     ----------
     image : Image.Image
         PIL Image in RGBA mode.
-    output : Path or str
-        Output SVG file path.
+    output : Path, str or TextIO
+        Output SVG file path, or an open text stream (e.g. ``io.StringIO``)
+        which is written to but not closed. Sidecar mode requires a path.
     background : str or None, optional
         CSS color for background compositing, or "transparent".
+    compress_level : int, optional
+        zlib compression level (0-9) for the embedded PNG. Default is 1,
+        which encodes several times faster than Pillow's default of 6 at a
+        small size cost.
+    embed : {"base64", "sidecar"}, optional
+        "base64" inlines the PNG as a data URI. "sidecar" writes the PNG next
+        to the SVG (same name, ``.png`` suffix) and references it by relative
+        href, skipping base64 encoding. Default is "base64".
+
+    Raises
+    ------
+    ValueError
+        If compress_level is outside 0-9, embed is not a known mode, or
+        embed is "sidecar" and output is not a path or ends in ``.png``.
 
     Notes
     -----
     If background is specified (and not "transparent"), composites the image
-    over a solid background before embedding.
+    over a solid background before embedding; opaque backgrounds are blended
+    in a single NumPy pass. Images that end up fully opaque
+    are embedded as RGB rather than RGBA. The encoded PNG is cached by a
+    hash of the pixels, background and compression level, so repeat renders
+    of the same image skip compositing and PNG encoding.
 
     Examples
     --------
     >>> img = Image.new("RGBA", (16, 16), (255, 0, 0, 255))
     >>> write_svg_raster(img, "out.svg")
     >>> write_svg_raster(img, "out_bg.svg", background="#ffffff")
+    >>> write_svg_raster(img, "out_linked.svg", embed="sidecar")  # writes out_linked.png
     """
-    if background and background != "transparent":
-        bg = Image.new("RGBA", image.size, background)
-        bg.alpha_composite(image)
-        image = bg.convert("RGBA")
-    else:
+    if not 0 <= compress_level <= 9:
+        raise ValueError("compress_level must be between 0 and 9")
+    if embed not in ("base64", "sidecar"):
+        raise ValueError(f"Unknown embed mode: {embed!r}")
+    sidecar = None
+    if embed == "sidecar":
+        if not isinstance(output, (str, os.PathLike)):
+            raise ValueError("embed='sidecar' needs an output path to place the PNG next to")
+        if Path(output).suffix.lower() == ".png":
+            # The sidecar would be the output file itself (or differ only in
+            # case) and be overwritten by the SVG.
+            raise ValueError("embed='sidecar' needs an output path that does not end in .png")
+        sidecar = Path(output).with_suffix(".png")
+    png = _encode_png_cached(image, background, compress_level)
+    w, h = image.size
+    with _open_output(output) as f:
+        f.write(
+            "<?xml version='1.0' encoding='UTF-8'?>\n"
+            f"<svg xmlns='http://www.w3.org/2000/svg' width='{w}' height='{h}' "
+            f"viewBox='0 0 {w} {h}'>\n"
+        )
+        if sidecar is not None:
+            sidecar.write_bytes(png)
+            # Percent-encoding also makes the name safe inside the XML attribute.
+            f.write(f"  <image href='{quote(sidecar.name)}'")
+        else:
+            f.write("  <image href='data:image/png;base64,")
+            # Encode in chunks that are a multiple of 3 bytes so no padding
+            # appears mid-stream and the full base64 string is never built.
+            view = memoryview(png)
+            for i in range(0, len(view), _B64_CHUNK):
+                f.write(base64.b64encode(view[i : i + _B64_CHUNK]).decode("ascii"))
+            f.write("'")
+        f.write(f" x='0' y='0' width='{w}' height='{h}' />\n</svg>\n")
+
+
+def _encode_png_cached(image: Image.Image, background: str | None, compress_level: int) -> bytes:
+    """Return PNG bytes for image, reusing a recent encode of identical content."""
+    # Hash the RGBA pixels: raw "P"/"LA" bytes omit the palette and transparency.
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    digest = hashlib.blake2b(digest_size=16)
+    header = f"{image.width}x{image.height}:{background}:{compress_level}"
+    digest.update(header.encode())
+    digest.update(image.tobytes())
+    key = digest.digest()
+
+    with _png_cache_lock:
+        png = _png_cache.get(key)
+        if png is not None:
+            _png_cache.move_to_end(key)
+            return png
+    # Encode outside the lock so concurrent renders of different images overlap.
+    png = _encode_png(image, background, compress_level)
+    with _png_cache_lock:
+        _png_cache[key] = png
+        _png_cache.move_to_end(key)
+        while len(_png_cache) > _PNG_CACHE_SIZE:
+            _png_cache.popitem(last=False)
+    return png
+
+
+def _encode_png(image: Image.Image, background: str | None, compress_level: int) -> bytes:
+    """Composite image over background (if any) and encode it as PNG."""
+    if image.mode != "RGBA":
         image = image.convert("RGBA")
+    if background and background != "transparent":
+        bg_color = ImageColor.getrgb(background)
+        if len(bg_color) == 3 or bg_color[3] == 255:
+            image = _blend_over_opaque(image, bg_color[:3])
+        else:
+            # Translucent backgrounds keep an alpha channel; let Pillow composite.
+            bg = Image.new("RGBA", image.size, bg_color)
+            bg.alpha_composite(image)
+            image = bg
+    if image.mode == "RGBA" and image.getchannel("A").getextrema() == (255, 255):
+        image = image.convert("RGB")
     buf = io.BytesIO()
-    image.save(buf, format="PNG")
-    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-    w, h = image.size
-    svg = f"""<?xml version='1.0' encoding='UTF-8'?>
-<svg xmlns='http://www.w3.org/2000/svg' width='{w}' height='{h}' viewBox='0 0 {w} {h}'>
-  <image href='data:image/png;base64,{b64}' x='0' y='0' width='{w}' height='{h}' />
-</svg>
-"""
-    with open(str(output), "w", encoding="utf-8") as f:
-        f.write(svg)
+    image.save(buf, format="PNG", optimize=False, compress_level=compress_level)
+    return buf.getvalue()
+
+
+def _blend_over_opaque(image: Image.Image, bg_rgb: tuple[int, ...]) -> Image.Image:
+    """Alpha-blend an RGBA image over a solid opaque color, returning RGB."""
+    arr = np.asarray(image)
+    alpha = arr[..., 3:4].astype(np.uint16)
+    rgb = arr[..., :3].astype(np.uint16)
+    bg = np.array(bg_rgb, dtype=np.uint16)
+    out = (rgb * alpha + bg * (255 - alpha) + 127) // 255
+    return Image.fromarray(out.astype(np.uint8))
@@ -0,0 +1,31 @@
+"""Image construction helpers shared by the test suite.
+
+Build test images from whole arrays in one call rather than pixel by pixel;
+``Image.putpixel`` is rejected at collection time (see ``_pixel_ban.py``).
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+from PIL import Image
+
+
+def make_rgba(rows: Sequence[Sequence[tuple[int, int, int, int]]] | np.ndarray) -> Image.Image:
+    """Build an RGBA image from rows of RGBA tuples in one array copy.
+
+    Parameters
+    ----------
+    rows : Sequence of Sequence of (R, G, B, A) tuples, or np.ndarray
+        Pixel rows, top to bottom, or an (H, W, 4) array.
+
+    Returns
+    -------
+    Image.Image
+        RGBA image of size ``(len(rows[0]), len(rows))``.
+
+    Examples
+    --------
+    >>> make_rgba([[(255, 0, 0, 255), (0, 0, 0, 0)]]).size
+    (2, 1)
+    """
+    return Image.fromarray(np.asarray(rows, dtype=np.uint8), "RGBA")
@@ -0,0 +1,60 @@
+"""Pytest plugin rejecting per-pixel image construction in the test suite.
+
+``Image.putpixel`` crosses the Python/C boundary once per pixel; tests build
+images from arrays instead (``tests._imgutil.make_rgba``). Loaded from
+``conftest.py``; collection fails if any collected test module, or any helper
+module in the same test packages, calls a banned method.
+"""
+
+import ast
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import pytest
+
+_BANNED_CALLS = frozenset({"putpixel"})
+
+
+def banned_calls(source: str) -> Iterator[tuple[int, str]]:
+    """Yield ``(lineno, name)`` for each banned call in Python source.
+
+    Only real call expressions count; the name in comments, strings or
+    docstrings does not.
+
+    Examples
+    --------
+    >>> list(banned_calls("img.putpixel((0, 0), 1)  # putpixel(\\n'putpixel('"))
+    [(1, 'putpixel')]
+    """
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if name in _BANNED_CALLS:
+            yield node.lineno, name
+
+
+def _modules_to_scan(test_paths: Iterable[Path]) -> list[Path]:
+    """Return the test modules plus every module in their enclosing test packages."""
+    paths = set(test_paths)
+    for path in list(paths):
+        package = path.parent
+        while (package / "__init__.py").exists():
+            paths.update(package.glob("*.py"))
+            package = package.parent
+    return sorted(paths)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Fail collection if scanned test code calls a banned per-pixel API."""
+    offenders = [
+        f"{path}:{lineno}: {name}()"
+        for path in _modules_to_scan(item.path for item in items)
+        for lineno, name in banned_calls(path.read_text(encoding="utf-8"))
+    ]
+    if offenders:
+        raise pytest.UsageError(
+            "Per-pixel image construction in tests; use tests._imgutil.make_rgba:\n"
+            + "\n".join(offenders)
+        )
@@ -0,0 +1,13 @@
+"""SVG output helpers shared by the integration tests."""
+
+from pathlib import Path
+
+
+def svg_head(path: Path, n: int = 512) -> bytes:
+    """Return the first ``n`` bytes of an SVG: the root tag and start of the body.
+
+    Size and viewBox checks only need the root element, so tests read this
+    prefix instead of the whole (possibly multi-megabyte) document.
+    """
+    with path.open("rb") as f:
+        return f.read(n)
@@ -5,82 +5,78 @@ from pathlib import Path
 import pytest
 from PIL import Image
 
+from ico_to_svg.ico_parser import load_ico_frames, open_ico_at_size
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# pytester drives the plugin tests in tests/unit/test_pixel_ban.py.
+pytest_plugins = ["pytester", "tests._pixel_ban"]
+
 
 @pytest.fixture
 def fixtures_dir() -> Path:
     """Return path to test fixtures directory."""
-    return Path(__file__).parent / "fixtures"
+    return FIXTURES_DIR
 
 
-@pytest.fixture
-def multi_size_ico(tmp_path: Path) -> Path:
-    """Generate multi-size ICO with 16, 32, 64, 128 px frames.
-
-    Parameters
-    ----------
-    tmp_path : Path
-        Pytest temporary directory.
+@pytest.fixture(scope="session")
+def multi_size_ico() -> Path:
+    """Multi-size ICO with 16, 32, 64, 128 px frames.
 
     Returns
     -------
     Path
-        Path to generated ICO file.
+        Path to the committed ICO file (read-only; regenerate with
+        ``tests/generate_ico.py``).
     """
-    ico_path = tmp_path / "multi.ico"
-    base = Image.new("RGBA", (256, 256), (255, 0, 0, 255))
-    # Draw simple pattern for visual identification
-    for i in range(256):
-        base.putpixel((i, i), (0, 128, 255, 255))
-        base.putpixel((i, 255 - i), (0, 128, 255, 255))
-    base.save(ico_path, format="ICO", sizes=[(16, 16), (32, 32), (64, 64), (128, 128)])
-    return ico_path
+    return FIXTURES_DIR / "test-multi.ico"
 
 
-@pytest.fixture
-def single_size_ico(tmp_path: Path) -> Path:
-    """Generate a single-size 48x48 ICO.
+@pytest.fixture(scope="session")
+def single_size_ico() -> Path:
+    """Single-size 48x48 ICO with a white border.
 
-    Parameters
-    ----------
-    tmp_path : Path
-        Pytest temporary directory.
+    Returns
+    -------
+    Path
+        Path to the committed ICO file (read-only; regenerate with
+        ``tests/generate_ico.py``).
+    """
+    return FIXTURES_DIR / "test-single.ico"
+
+
+@pytest.fixture(scope="session")
+def non_square_ico() -> Path:
+    """ICO generated from a non-square 32x64 image.
 
     Returns
     -------
     Path
-        Path to generated ICO file.
+        Path to the committed ICO file (read-only; regenerate with
+        ``tests/generate_ico.py``).
     """
-    ico_path = tmp_path / "single.ico"
-    img = Image.new("RGBA", (48, 48), (0, 200, 0, 255))
-    # Draw border
-    for x in range(48):
-        img.putpixel((x, 0), (255, 255, 255, 255))
-        img.putpixel((x, 47), (255, 255, 255, 255))
-    for y in range(48):
-        img.putpixel((0, y), (255, 255, 255, 255))
-        img.putpixel((47, y), (255, 255, 255, 255))
-    img.save(ico_path, format="ICO")
-    return ico_path
+    return FIXTURES_DIR / "test-nonsquare.ico"
 
 
-@pytest.fixture
-def non_square_ico(tmp_path: Path) -> Path:
-    """Generate a non-square 32x64 ICO.
+@pytest.fixture(scope="session")
+def multi_ico_frames(multi_size_ico: Path) -> dict[tuple[int, int], Image.Image]:
+    """Decoded frames of ``multi_size_ico``, keyed by size.
 
     Parameters
     ----------
-    tmp_path : Path
-        Pytest temporary directory.
+    multi_size_ico : Path
+        Multi-size ICO fixture.
 
     Returns
     -------
-    Path
-        Path to generated ICO file.
+    Dict[Tuple[int, int], Image.Image]
+        RGBA image for every frame, decoded once per session. Tests that vary
+        only a rendering parameter use these instead of re-running the
+        parse/decode stage for each case; treat the images as read-only.
     """
-    ico_path = tmp_path / "non_square.ico"
-    img = Image.new("RGBA", (32, 64), (128, 0, 128, 255))
-    img.save(ico_path, format="ICO")
-    return ico_path
+    return {
+        size: open_ico_at_size(multi_size_ico, size) for size in load_ico_frames(multi_size_ico)
+    }
 
 
 @pytest.fixture
@@ -5,16 +5,63 @@ as a standalone executable without requiring Python or virtual environment.
 """
 
 import json
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
-
 # Path to the compiled executable
 EXE_PATH = Path(__file__).parent.parent.parent / "dist" / "ico-to-svg.exe"
 ALIAS_PATH = Path(__file__).parent.parent.parent / "dist" / "ico2svg.exe"
 
+# Trivial commands (help, version, info) finish well within this even with a
+# cold PyInstaller unpack; a hang fails fast instead of eating 10s.
+QUICK_TIMEOUT = 5
+
+# Conversions also import NumPy from the onefile bundle; keep their headroom.
+CONVERT_TIMEOUT = 10
+
+# Every token must appear somewhere in the help text. Used with match() so the
+# lookaheads are tried from position 0 only.
+_HELP_RE = re.compile(rb"(?=.*convert)(?=.*info)", re.S)
+_CONVERT_HELP_RE = re.compile(rb"(?=.*--mode)(?=.*raster)(?=.*vector)", re.S)
+
+
+def _run(args, timeout=QUICK_TIMEOUT):
+    """Run the executable and return ``(returncode, stdout, stderr)`` as bytes.
+
+    Output is left undecoded; tests match byte substrings and only decode
+    when building a failure message.
+    """
+    result = subprocess.run(args, capture_output=True, timeout=timeout)
+    return result.returncode, result.stdout, result.stderr
+
+
+def _convert_once(tmp_path_factory, single_size_ico, *flags, timeout=CONVERT_TIMEOUT):
+    """Convert ``single_size_ico`` with the exe and return the output path."""
+    output = tmp_path_factory.mktemp("exe_output") / "output.svg"
+    rc, _out, err = _run(
+        [str(EXE_PATH), "convert", str(single_size_ico), str(output), *flags], timeout=timeout
+    )
+    assert rc == 0, f"Convert failed: {err.decode(errors='replace')}"
+    return output
+
+
+# Conversions whose output several tests only read: spawn the exe once per
+# module rather than once per test. Tests that vary a flag still spawn their own.
+@pytest.fixture(scope="module")
+def raster_default_svg(tmp_path_factory, single_size_ico):
+    """Raster SVG produced by a default ``convert`` of ``single_size_ico``."""
+    return _convert_once(tmp_path_factory, single_size_ico)
+
+
+@pytest.fixture(scope="module")
+def vector_svg(tmp_path_factory, single_size_ico):
+    """Vector SVG produced by ``convert --mode vector`` of ``single_size_ico``."""
+    return _convert_once(tmp_path_factory, single_size_ico, "--mode", "vector", timeout=30)
+
 
 @pytest.mark.skipif(not EXE_PATH.exists(), reason="Executable not built yet")
 class TestExeBasicCommands:
@@ -31,158 +78,80 @@ class TestExeBasicCommands:
 
     def test_exe_version(self):
         """Test --version flag returns version string."""
-        result = subprocess.run(
-            [str(EXE_PATH), "--version"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Version command failed: {result.stderr}"
-        assert "0.1.0" in result.stdout, f"Expected version in output: {result.stdout}"
+        rc, out, err = _run([str(EXE_PATH), "--version"])
+        assert rc == 0, f"Version command failed: {err.decode(errors='replace')}"
+        assert b"0.1.0" in out, f"Expected version in output: {out.decode(errors='replace')}"
 
     def test_exe_help(self):
-        """Test --help flag shows usage information."""
-        result = subprocess.run(
-            [str(EXE_PATH), "--help"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Help command failed: {result.stderr}"
-        assert "convert" in result.stdout, "Missing 'convert' subcommand in help"
-        assert "info" in result.stdout, "Missing 'info' subcommand in help"
+        """Test --help flag lists both subcommands."""
+        rc, out, err = _run([str(EXE_PATH), "--help"])
+        assert rc == 0, f"Help command failed: {err.decode(errors='replace')}"
+        assert _HELP_RE.match(out), f"Missing subcommands in help:\n{out.decode(errors='replace')}"
 
     def test_convert_help(self):
         """Test convert subcommand help."""
-        result = subprocess.run(
-            [str(EXE_PATH), "convert", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Convert help failed: {result.stderr}"
-        assert "--mode" in result.stdout, "Missing --mode option"
-        assert "raster" in result.stdout, "Missing raster mode"
-        assert "vector" in result.stdout, "Missing vector mode"
-
-    def test_info_help(self):
-        """Test info subcommand help."""
-        result = subprocess.run(
-            [str(EXE_PATH), "info", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        rc, out, err = _run([str(EXE_PATH), "convert", "--help"])
+        assert rc == 0, f"Convert help failed: {err.decode(errors='replace')}"
+        assert _CONVERT_HELP_RE.match(out), (
+            f"Missing --mode/raster/vector in help:\n{out.decode(errors='replace')}"
         )
-        assert result.returncode == 0, f"Info help failed: {result.stderr}"
-        assert "--json" in result.stdout, "Missing --json option"
 
 
 @pytest.mark.skipif(not EXE_PATH.exists(), reason="Executable not built yet")
 class TestExeInfoCommand:
-    """Test the info subcommand with various ICO files."""
-
-    def test_info_single_size(self, single_size_ico):
-        """Test info command with single-size ICO."""
-        result = subprocess.run(
-            [str(EXE_PATH), "info", str(single_size_ico)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Info command failed: {result.stderr}"
-        assert "Available sizes:" in result.stdout
-        # Verify at least one size is listed (fixture may create various sizes)
-        assert any(size in result.stdout for size in ["16x16", "32x32", "48x48", "256x256"])
-
-    def test_info_multi_size(self, multi_size_ico):
-        """Test info command with multi-size ICO."""
-        result = subprocess.run(
-            [str(EXE_PATH), "info", str(multi_size_ico)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Info command failed: {result.stderr}"
-        assert "Available sizes:" in result.stdout
+    """Smoke-test the info subcommand in the frozen binary.
+
+    Output variants and error cases are covered in-process by
+    tests/integration/test_info_command.py; one spawn here checks that the
+    subcommand works at all once bundled.
+    """
 
     def test_info_json_output(self, multi_size_ico):
-        """Test info command with --json flag."""
-        result = subprocess.run(
-            [str(EXE_PATH), "info", str(multi_size_ico), "--json"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Info JSON failed: {result.stderr}"
-
-        # Verify valid JSON
-        try:
-            data = json.loads(result.stdout)
-            assert isinstance(data, list), "JSON output should be a list"
-            assert len(data) > 0, "JSON output should contain sizes"
-            for item in data:
-                assert "width" in item
-                assert "height" in item
-        except json.JSONDecodeError as e:
-            pytest.fail(f"Invalid JSON output: {e}\n{result.stdout}")
-
-    def test_info_nonexistent_file(self, tmp_path):
-        """Test info command with nonexistent file."""
-        nonexistent = tmp_path / "does_not_exist.ico"
-        result = subprocess.run(
-            [str(EXE_PATH), "info", str(nonexistent)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode != 0, "Should fail on nonexistent file"
+        """Test info --json lists every frame size."""
+        rc, out, err = _run([str(EXE_PATH), "info", str(multi_size_ico), "--json"])
+        assert rc == 0, f"Info command failed: {err.decode(errors='replace')}"
+        assert json.loads(out) == [
+            {"width": 16, "height": 16},
+            {"width": 32, "height": 32},
+            {"width": 64, "height": 64},
+            {"width": 128, "height": 128},
+        ]
 
 
 @pytest.mark.skipif(not EXE_PATH.exists(), reason="Executable not built yet")
 class TestExeConvertRaster:
     """Test raster mode conversion."""
 
-    def test_convert_raster_default(self, single_size_ico, tmp_path):
+    def test_convert_raster_default(self, raster_default_svg):
         """Test basic raster conversion (default mode)."""
-        output = tmp_path / "output.svg"
-        result = subprocess.run(
-            [str(EXE_PATH), "convert", str(single_size_ico), str(output)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Convert failed: {result.stderr}"
-        assert output.exists(), "Output SVG not created"
-        assert output.stat().st_size > 0, "Output SVG is empty"
+        assert raster_default_svg.exists(), "Output SVG not created"
+        assert raster_default_svg.stat().st_size > 0, "Output SVG is empty"
 
         # Verify it's a valid SVG with embedded image
-        content = output.read_text()
-        assert '<?xml version' in content
-        assert '<svg' in content
-        assert 'data:image/png;base64,' in content
+        content = raster_default_svg.read_text()
+        assert "<?xml version" in content
+        assert "<svg" in content
+        assert "data:image/png;base64," in content
 
-    def test_convert_raster_explicit(self, single_size_ico, tmp_path):
+    def test_convert_raster_explicit(self, single_size_ico, tmp_path, raster_default_svg):
         """Test raster conversion with explicit --mode raster."""
         output = tmp_path / "output_raster.svg"
-        result = subprocess.run(
+        rc, out, err = _run(
             [str(EXE_PATH), "convert", str(single_size_ico), str(output), "--mode", "raster"],
-            capture_output=True,
-            text=True,
-            timeout=10,
+            timeout=CONVERT_TIMEOUT,
         )
-        assert result.returncode == 0, f"Convert failed: {result.stderr}"
+        assert rc == 0, f"Convert failed: {err.decode(errors='replace')}"
         assert output.exists(), "Output SVG not created"
+        assert output.read_bytes() == raster_default_svg.read_bytes()
 
     def test_convert_raster_specific_size(self, multi_size_ico, tmp_path):
         """Test raster conversion with --size option."""
         output = tmp_path / "output_32.svg"
-        result = subprocess.run(
+        rc, out, err = _run(
             [str(EXE_PATH), "convert", str(multi_size_ico), str(output), "--size", "32"],
-            capture_output=True,
-            text=True,
-            timeout=10,
+            timeout=CONVERT_TIMEOUT,
         )
-        assert result.returncode == 0, f"Convert failed: {result.stderr}"
+        assert rc == 0, f"Convert failed: {err.decode(errors='replace')}"
         assert output.exists(), "Output SVG not created"
 
         # Verify dimensions
@@ -192,7 +161,7 @@ class TestExeConvertRaster:
     def test_convert_raster_with_background(self, single_size_ico, tmp_path):
         """Test raster conversion with background color."""
         output = tmp_path / "output_bg.svg"
-        result = subprocess.run(
+        rc, out, err = _run(
             [
                 str(EXE_PATH),
                 "convert",
@@ -201,41 +170,32 @@ class TestExeConvertRaster:
                 "--background",
                 "white",
             ],
-            capture_output=True,
-            text=True,
-            timeout=10,
+            timeout=CONVERT_TIMEOUT,
         )
-        assert result.returncode == 0, f"Convert failed: {result.stderr}"
+        assert rc == 0, f"Convert failed: {err.decode(errors='replace')}"
         assert output.exists(), "Output SVG not created"
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(not EXE_PATH.exists(), reason="Executable not built yet")
 class TestExeConvertVector:
     """Test vector mode conversion."""
 
-    def test_convert_vector_mode(self, single_size_ico, tmp_path):
+    def test_convert_vector_mode(self, vector_svg):
         """Test vector mode conversion."""
-        output = tmp_path / "output_vector.svg"
-        result = subprocess.run(
-            [str(EXE_PATH), "convert", str(single_size_ico), str(output), "--mode", "vector"],
-            capture_output=True,
-            text=True,
-            timeout=30,  # Vector mode can be slower
-        )
-        assert result.returncode == 0, f"Vector convert failed: {result.stderr}"
-        assert output.exists(), "Output SVG not created"
+        assert vector_svg.exists(), "Output SVG not created"
 
         # Verify it's a valid SVG with paths (not embedded image)
-        content = output.read_text()
-        assert '<?xml version' in content
-        assert '<svg' in content
-        assert '<path' in content, "Vector SVG should contain path elements"
-        assert 'data:image/png;base64,' not in content, "Vector SVG should not embed images"
+        content = vector_svg.read_text()
+        assert "<?xml version" in content
+        assert "<svg" in content
+        assert "<path" in content, "Vector SVG should contain path elements"
+        assert "data:image/png;base64," not in content, "Vector SVG should not embed images"
 
     def test_convert_vector_alpha_threshold(self, single_size_ico, tmp_path):
         """Test vector conversion with custom alpha threshold."""
         output = tmp_path / "output_alpha.svg"
-        result = subprocess.run(
+        rc, out, err = _run(
             [
                 str(EXE_PATH),
                 "convert",
@@ -246,11 +206,9 @@ class TestExeConvertVector:
                 "--alpha-threshold",
                 "128",
             ],
-            capture_output=True,
-            text=True,
             timeout=30,
         )
-        assert result.returncode == 0, f"Convert failed: {result.stderr}"
+        assert rc == 0, f"Convert failed: {err.decode(errors='replace')}"
         assert output.exists(), "Output SVG not created"
 
 
@@ -260,26 +218,9 @@ class TestExeAlias:
 
     def test_alias_version(self):
         """Test alias executable version command."""
-        result = subprocess.run(
-            [str(ALIAS_PATH), "--version"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Alias version failed: {result.stderr}"
-        assert "0.1.0" in result.stdout
-
-    def test_alias_convert(self, single_size_ico, tmp_path):
-        """Test conversion using alias executable."""
-        output = tmp_path / "output_alias.svg"
-        result = subprocess.run(
-            [str(ALIAS_PATH), "convert", str(single_size_ico), str(output)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode == 0, f"Alias convert failed: {result.stderr}"
-        assert output.exists(), "Output SVG not created"
+        rc, out, err = _run([str(ALIAS_PATH), "--version"])
+        assert rc == 0, f"Alias version failed: {err.decode(errors='replace')}"
+        assert b"0.1.0" in out
 
 
 @pytest.mark.skipif(not EXE_PATH.exists(), reason="Executable not built yet")
@@ -287,16 +228,24 @@ class TestExeStability:
     """Test executable stability and edge cases."""
 
     def test_multiple_conversions(self, single_size_ico, tmp_path):
-        """Test running multiple conversions in sequence."""
-        for i in range(5):
-            output = tmp_path / f"output_{i}.svg"
-            result = subprocess.run(
-                [str(EXE_PATH), "convert", str(single_size_ico), str(output)],
-                capture_output=True,
-                text=True,
-                timeout=10,
+        """Test running multiple conversions concurrently.
+
+        The runs write independent outputs, so they overlap in pairs; more
+        onefile launches at once would contend for disk while unpacking.
+        """
+        outputs = [tmp_path / f"output_{i}.svg" for i in range(5)]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(
+                pool.map(
+                    lambda output: _run(
+                        [str(EXE_PATH), "convert", str(single_size_ico), str(output)],
+                        timeout=CONVERT_TIMEOUT,
+                    ),
+                    outputs,
+                )
             )
-            assert result.returncode == 0, f"Conversion {i} failed: {result.stderr}"
+        for i, ((rc, _out, err), output) in enumerate(zip(results, outputs, strict=True)):
+            assert rc == 0, f"Conversion {i} failed: {err.decode(errors='replace')}"
             assert output.exists(), f"Output {i} not created"
 
     def test_invalid_input_file(self, tmp_path):
@@ -305,20 +254,12 @@ class TestExeStability:
         invalid.write_text("This is not an ICO file")
         output = tmp_path / "output.svg"
 
-        result = subprocess.run(
-            [str(EXE_PATH), "convert", str(invalid), str(output)],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        rc, out, err = _run(
+            [str(EXE_PATH), "convert", str(invalid), str(output)], timeout=CONVERT_TIMEOUT
         )
-        assert result.returncode != 0, "Should fail on invalid input"
+        assert rc != 0, "Should fail on invalid input"
 
     def test_missing_required_args(self):
         """Test handling of missing required arguments."""
-        result = subprocess.run(
-            [str(EXE_PATH), "convert"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        assert result.returncode != 0, "Should fail with missing arguments"
+        rc, out, err = _run([str(EXE_PATH), "convert"])
+        assert rc != 0, "Should fail with missing arguments"
@@ -1,30 +1,121 @@
-# SCHEDULE FOR DELETION: Manual test data generator, superseded by conftest.py fixtures
-# All test ICO generation is now handled dynamically in tests/conftest.py
-# No longer needed as pytest creates test files on-the-fly
+"""Regenerate the committed test ICOs in ``tests/fixtures``.
+
+The ICOs are checked in so test runs never encode them; ``conftest.py`` only
+returns their paths. Run this file directly after changing a builder below::
+
+    python tests/generate_ico.py
+"""
+
+import io
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# NumPy and Pillow are imported inside the builders, so importing this module
+# (e.g. during test collection) stays cheap.
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+MULTI_ICO_SIZES = [(16, 16), (32, 32), (64, 64), (128, 128)]
+
+
+def _write_ico(image: "Image.Image", path: Path, **params: Any) -> Path:
+    """Encode ``image`` as ICO in memory, then write the file in one call."""
+    buf = io.BytesIO()
+    image.save(buf, format="ICO", **params)
+    path.write_bytes(buf.getbuffer())
+    return path
+
+
+def _build_multi_ico(path: Path) -> Path:
+    """Write a 16/32/64/128 px ICO drawn from a 256x256 patterned base.
+
+    Parameters
+    ----------
+    path : Path
+        Destination ICO file path.
+
+    Returns
+    -------
+    Path
+        The same ``path``, for convenience.
+    """
+    import numpy as np
+    from PIL import Image
+
+    base_size = 256
+    arr = np.full((base_size, base_size, 4), (255, 0, 0, 255), dtype=np.uint8)
+
+    # Draw simple pattern for visual identification: both diagonals, then border
+    idx = np.arange(base_size)
+    arr[idx, idx] = (0, 128, 255, 255)
+    arr[idx, base_size - 1 - idx] = (0, 128, 255, 255)
+    arr[0, :] = arr[-1, :] = arr[:, 0] = arr[:, -1] = (0, 200, 0, 255)
+    return _write_ico(Image.fromarray(arr, "RGBA"), path, sizes=MULTI_ICO_SIZES)
+
+
+def _build_single_ico(path: Path) -> Path:
+    """Write a single-size 48x48 ICO with a white border.
+
+    Parameters
+    ----------
+    path : Path
+        Destination ICO file path.
+
+    Returns
+    -------
+    Path
+        The same ``path``, for convenience.
+    """
+    import numpy as np
+    from PIL import Image
+
+    arr = np.full((48, 48, 4), (0, 200, 0, 255), dtype=np.uint8)
+    # Draw border
+    arr[0, :] = arr[-1, :] = arr[:, 0] = arr[:, -1] = (255, 255, 255, 255)
+    return _write_ico(Image.fromarray(arr, "RGBA"), path)
+
+
+def _build_non_square_ico(path: Path) -> Path:
+    """Write an ICO from a solid non-square 32x64 image.
+
+    Parameters
+    ----------
+    path : Path
+        Destination ICO file path.
+
+    Returns
+    -------
+    Path
+        The same ``path``, for convenience.
+    """
+    from PIL import Image
+
+    return _write_ico(Image.new("RGBA", (32, 64), (128, 0, 128, 255)), path)
+
+
+def build_test_icos(out_dir: Path = FIXTURES_DIR) -> list[Path]:
+    """Write all test ICOs into ``out_dir``.
+
+    Parameters
+    ----------
+    out_dir : Path, optional
+        Destination directory, created if needed. Default is ``tests/fixtures``.
+
+    Returns
+    -------
+    List[Path]
+        Paths of the written ICO files.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        _build_multi_ico(out_dir / "test-multi.ico"),
+        _build_single_ico(out_dir / "test-single.ico"),
+        _build_non_square_ico(out_dir / "test-nonsquare.ico"),
+    ]
+
 
-from PIL import Image
-
-# Ensure data directory exists
-out_dir = Path(__file__).resolve().parents[1] / "data"
-out_dir.mkdir(parents=True, exist_ok=True)
-
-# Create a base 256x256 and let Pillow generate multiple sizes for ICO
-base_size = 256
-base = Image.new("RGBA", (base_size, base_size), (255, 0, 0, 255))
-
-# Draw simple pattern
-for i in range(base_size):
-    base.putpixel((i, i), (0, 128, 255, 255))
-    base.putpixel((i, base_size - 1 - i), (0, 128, 255, 255))
-for x in range(base_size):
-    base.putpixel((x, 0), (0, 200, 0, 255))
-    base.putpixel((x, base_size - 1), (0, 200, 0, 255))
-for y in range(base_size):
-    base.putpixel((0, y), (0, 200, 0, 255))
-    base.putpixel((base_size - 1, y), (0, 200, 0, 255))
-
-multi_path = out_dir / "test-multi.ico"
-sizes = [(16, 16), (32, 32), (64, 64), (128, 128)]
-base.save(multi_path, format="ICO", sizes=sizes)
-print(f"Created test ICO: {multi_path}")
+if __name__ == "__main__":
+    for path in build_test_icos():
+        print(f"Created test ICO: {path}")
@@ -0,0 +1,49 @@
+"""Integration tests for batch conversion."""
+
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from ico_to_svg import convert_ico_to_svg, convert_ico_to_svg_batch, core
+
+
+class TestBatchConversion:
+    """Integration tests for convert_ico_to_svg_batch."""
+
+    def test_batch_matches_single_conversions(self, multi_size_ico: Path, tmp_path: Path) -> None:
+        """Test that batch outputs are identical to one-shot conversions."""
+        requests = [
+            ("16", tmp_path / "b16.svg", "raster"),
+            ("32", tmp_path / "b32.svg", "vector"),
+            (None, tmp_path / "bmax.svg", "raster"),
+        ]
+        convert_ico_to_svg_batch(multi_size_ico, requests)
+        for size, output, mode in requests:
+            single = tmp_path / f"single-{output.name}"
+            convert_ico_to_svg(multi_size_ico, single, mode=mode, size=size)
+            assert output.read_text() == single.read_text()
+
+    def test_each_frame_decoded_once(
+        self, multi_size_ico: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that requests resolving to the same frame share one decode."""
+        opened: list[tuple[int, int]] = []
+        original = core.open_ico_at_size
+
+        def counting_open(path: Path | str, size: tuple[int, int]) -> Image.Image:
+            opened.append(size)
+            return original(path, size)
+
+        monkeypatch.setattr(core, "open_ico_at_size", counting_open)
+        convert_ico_to_svg_batch(
+            multi_size_ico,
+            [
+                ("32", tmp_path / "a.svg", "raster"),
+                ("32x32", tmp_path / "b.svg", "vector"),
+                ("20", tmp_path / "c.svg", "vector"),  # Resolves to 32x32 as well
+                ("64", tmp_path / "d.svg", "raster"),
+            ],
+        )
+        assert sorted(opened) == [(32, 32), (64, 64)]
+        assert all((tmp_path / name).exists() for name in ("a.svg", "b.svg", "c.svg", "d.svg"))
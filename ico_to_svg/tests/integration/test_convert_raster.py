@@ -1,10 +1,17 @@
 """Integration tests for raster conversion mode."""
 
+import re
 from pathlib import Path
 
 import pytest
 
 from ico_to_svg import convert_ico_to_svg
+from tests._svgutil import svg_head
+
+
+def _width_re(px: int) -> re.Pattern[bytes]:
+    """Match the root ``width`` attribute in either quote style, with or without px."""
+    return re.compile(rb"\bwidth=['\"]%d(px)?['\"]" % px)
 
 
 class TestRasterConversion:
@@ -15,9 +22,9 @@ class TestRasterConversion:
         output = tmp_path / "out-32.svg"
         convert_ico_to_svg(str(multi_size_ico), str(output), mode="raster", size="32")
         assert output.exists()
-        content = output.read_text()
-        assert "data:image/png;base64," in content
-        assert "width='32'" in content or 'width="32"' in content
+        head = svg_head(output)
+        assert b"data:image/png;base64," in head
+        assert _width_re(32).search(head)
 
     def test_convert_with_background(self, multi_size_ico: Path, tmp_path: Path) -> None:
         """Test raster conversion with background color."""
@@ -39,9 +46,8 @@ class TestRasterConversion:
         output = tmp_path / "out-default.svg"
         convert_ico_to_svg(str(multi_size_ico), str(output), mode="raster")
         assert output.exists()
-        content = output.read_text()
         # Should use 128x128 (largest)
-        assert "128" in content
+        assert _width_re(128).search(svg_head(output))
 
     def test_convert_single_size_ico(self, single_size_ico: Path, tmp_path: Path) -> None:
         """Test conversion of single-size ICO."""
@@ -67,3 +73,12 @@ class TestRasterConversion:
             background="transparent",
         )
         assert output.exists()
+
+    def test_sidecar_embed(self, multi_size_ico: Path, tmp_path: Path) -> None:
+        """Test raster conversion that links a sidecar PNG instead of inlining it."""
+        output = tmp_path / "out-sidecar.svg"
+        convert_ico_to_svg(multi_size_ico, output, size="32", embed="sidecar")
+        assert (tmp_path / "out-sidecar.png").exists()
+        content = output.read_text()
+        assert "href='out-sidecar.png'" in content
+        assert "data:image/png;base64," not in content
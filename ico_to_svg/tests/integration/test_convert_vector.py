@@ -1,12 +1,21 @@
 """Integration tests for vector conversion mode."""
 
+import warnings
 from pathlib import Path
 
+import numpy as np
 import pytest
+from PIL import Image
 
-from ico_to_svg import convert_ico_to_svg
+from ico_to_svg import VectorFallbackWarning, convert_ico_to_svg, core
+from ico_to_svg.cli import main
+from ico_to_svg.svg_writer import vectorize, write_svg_vector
+from tests._svgutil import svg_head
 
 
+# End-to-end vector conversions to disk for every frame size; keep these out of
+# the quick `-m "not slow"` loop.
+@pytest.mark.slow
 class TestVectorConversion:
     """Integration tests for vector conversion mode."""
 
@@ -20,17 +29,22 @@ class TestVectorConversion:
         assert "data:image/png;base64," not in content  # Should be vector, not raster
 
     @pytest.mark.parametrize("threshold", [8, 16, 32, 64, 128])
-    def test_alpha_thresholds(self, multi_size_ico: Path, tmp_path: Path, threshold: int) -> None:
-        """Test vector conversion with various alpha thresholds."""
+    def test_alpha_thresholds(
+        self,
+        multi_ico_frames: dict[tuple[int, int], Image.Image],
+        tmp_path: Path,
+        threshold: int,
+    ) -> None:
+        """Test vectorizing and writing at various alpha thresholds.
+
+        Only the threshold varies, so the 16x16 frame is decoded once for all
+        cases and each case runs just the vector stage.
+        """
         output = tmp_path / f"out-vec-{threshold}.svg"
-        convert_ico_to_svg(
-            str(multi_size_ico),
-            str(output),
-            mode="vector",
-            alpha_threshold=threshold,
-            size="16",  # Smaller size for faster test
-        )
+        color_runs, w, h = vectorize(multi_ico_frames[(16, 16)], threshold)
+        write_svg_vector(color_runs, w, h, output)
         assert output.exists()
+        assert b'viewBox="0 0 16 16"' in svg_head(output)
 
     def test_vector_with_background(self, multi_size_ico: Path, tmp_path: Path) -> None:
         """Test vector conversion with background color."""
@@ -43,9 +57,9 @@ class TestVectorConversion:
             size="32",
         )
         assert output.exists()
-        content = output.read_text()
-        assert "<rect" in content  # Background rectangle
-        assert "#ffffff" in content
+        head = svg_head(output)
+        assert b"<rect" in head  # Background rectangle
+        assert b"#ffffff" in head
 
     def test_vector_default_alpha_threshold(self, single_size_ico: Path, tmp_path: Path) -> None:
         """Test that default alpha threshold is 16."""
@@ -62,5 +76,54 @@ class TestVectorConversion:
         output = tmp_path / "out-vec-size.svg"
         convert_ico_to_svg(str(multi_size_ico), str(output), mode="vector", size="64")
         assert output.exists()
-        content = output.read_text()
-        assert 'viewBox="0 0 64 64"' in content
+        assert b'viewBox="0 0 64 64"' in svg_head(output)
+
+    def test_photographic_icon_falls_back_to_raster(self, tmp_path: Path) -> None:
+        """Test that icons with too many colors are written in raster mode."""
+        noise = np.random.default_rng(0).integers(0, 256, (32, 32, 4), dtype=np.uint8)
+        noise[..., 3] = 255
+        ico = tmp_path / "photo.ico"
+        Image.fromarray(noise, "RGBA").save(ico, format="ICO", sizes=[(32, 32)])
+
+        output = tmp_path / "photo.svg"
+        with pytest.warns(VectorFallbackWarning, match="using raster mode"):
+            used = convert_ico_to_svg(str(ico), str(output), mode="vector")
+        assert used == "raster"
+        assert "data:image/png;base64," in output.read_text()
+
+        forced = tmp_path / "photo-forced.svg"
+        used = convert_ico_to_svg(str(ico), str(forced), mode="vector", force_vector=True)
+        assert used == "vector"
+        assert "<path" in forced.read_text()
+
+    def test_cli_fallback_names_force_vector_flag(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test the CLI reports the raster fallback on stderr with the CLI flag."""
+        noise = np.random.default_rng(0).integers(0, 256, (32, 32, 4), dtype=np.uint8)
+        noise[..., 3] = 255
+        ico = tmp_path / "photo.ico"
+        Image.fromarray(noise, "RGBA").save(ico, format="ICO", sizes=[(32, 32)])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # nothing may escape as a raw warning
+            main(["convert", str(ico), str(tmp_path / "photo.svg"), "--mode", "vector"])
+        captured = capsys.readouterr()
+        assert "warning: Image has" in captured.err
+        assert "--force-vector" in captured.err
+        assert "force_vector=" not in captured.err
+        assert "(raster mode)" in captured.out
+
+    def test_cli_reports_only_fallback_warnings(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that unrelated library warnings are not turned into CLI warning lines."""
+
+        def convert_with_deprecation(**kwargs: object) -> str:
+            warnings.warn("old Pillow API", DeprecationWarning, stacklevel=1)
+            return "vector"
+
+        monkeypatch.setattr(core, "convert_ico_to_svg", convert_with_deprecation)
+        with pytest.warns(DeprecationWarning, match="old Pillow API"):
+            main(["convert", "in.ico", str(tmp_path / "out.svg"), "--mode", "vector"])
+        assert "warning:" not in capsys.readouterr().err
@@ -1,48 +1,56 @@
-# SCHEDULE FOR DELETION: Legacy smoke test, superseded by pytest integration tests
-# References non-existent .venv_cli and data/ directories
-# All functionality covered by tests/integration/
-"""Simple smoke tests for ico-to-svg CLI logic."""
+"""Simple smoke tests for ico-to-svg CLI logic.
 
-import subprocess
+Calls the CLI entry point in-process, so it runs from a plain
+``pip install -e .`` checkout without building the executable::
+
+    python tests/smoke.py
+"""
+
+import contextlib
+import io
 import sys
+import tempfile
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
-VENV = ROOT / ".venv_cli" / "Scripts"
-CLI = VENV / "ico-to-svg.exe"
-DATA = ROOT / "data"
-ICO = DATA / "test-multi.ico"
+from ico_to_svg.cli import main as cli_main
+
+ICO = Path(__file__).resolve().parent / "fixtures" / "test-multi.ico"
 
 
-def run(cmd):
-    print("==>", " ".join(cmd))
-    completed = subprocess.run(cmd, capture_output=True, text=True)
-    print(completed.stdout)
-    if completed.stderr:
-        print(completed.stderr, file=sys.stderr)
-    completed.check_returncode()
+def run(argv: list[str]) -> None:
+    print("==> ico-to-svg", " ".join(argv))
+    stdout = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            cli_main(argv)
+    except SystemExit as exc:  # argparse errors
+        if exc.code:
+            raise
+    finally:
+        print(stdout.getvalue())
 
 
-def main():
+def main() -> None:
     if not ICO.exists():
         print("ICO file missing; run generate_ico.py first", file=sys.stderr)
         sys.exit(1)
-    run([str(CLI), "info", str(ICO), "--json"])
-    run([str(CLI), "convert", str(ICO), str(DATA / "test-64-raster.svg"), "--size", "64"])
-    run(
-        [
-            str(CLI),
-            "convert",
-            str(ICO),
-            str(DATA / "test-64-vector.svg"),
-            "--size",
-            "64",
-            "--mode",
-            "vector",
-            "--alpha-threshold",
-            "16",
-        ]
-    )
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        run(["info", str(ICO), "--json"])
+        run(["convert", str(ICO), str(out_dir / "test-64-raster.svg"), "--size", "64"])
+        run(
+            [
+                "convert",
+                str(ICO),
+                str(out_dir / "test-64-vector.svg"),
+                "--size",
+                "64",
+                "--mode",
+                "vector",
+                "--alpha-threshold",
+                "16",
+            ]
+        )
     print("Smoke tests passed.")
 
 
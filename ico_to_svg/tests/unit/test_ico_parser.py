@@ -1,8 +1,10 @@
 """Unit tests for ICO parsing functions."""
 
+import os
 from pathlib import Path
 
 import pytest
+from PIL import Image
 
 from ico_to_svg.ico_parser import load_ico_frames, open_ico_at_size, parse_size_arg
 
@@ -10,39 +12,41 @@ from ico_to_svg.ico_parser import load_ico_frames, open_ico_at_size, parse_size_
 class TestParseSizeArg:
     """Test size argument parsing."""
 
-    @pytest.mark.parametrize(
-        "size_str,expected",
-        [
-            ("256", (256, 256)),
-            ("32", (32, 32)),
-            ("1", (1, 1)),
-            ("1024", (1024, 1024)),
-            ("32x64", (32, 64)),
-            ("16X32", (16, 32)),  # Case insensitive
-            ("128x128", (128, 128)),
-        ],
-    )
-    def test_valid_size_formats(self, size_str: str, expected: tuple[int, int]) -> None:
+    # Table-driven rather than parametrized: one test item instead of fifteen
+    # for a pure function, so collection/setup does not dwarf the checks.
+    VALID = [
+        ("256", (256, 256)),
+        ("32", (32, 32)),
+        ("1", (1, 1)),
+        ("1024", (1024, 1024)),
+        ("32x64", (32, 64)),
+        ("16X32", (16, 32)),  # Case insensitive
+        ("128x128", (128, 128)),
+    ]
+    INVALID = [
+        "0",  # Zero dimension
+        "-32",  # Negative
+        "32x0",  # Zero height
+        "32x-16",  # Negative height
+        "32x64x128",  # Too many dimensions
+        "abc",  # Non-numeric
+        "32xabc",  # Invalid height
+        "",  # Empty
+    ]
+
+    def test_valid_size_formats(self) -> None:
         """Test valid size string parsing."""
-        assert parse_size_arg(size_str) == expected
-
-    @pytest.mark.parametrize(
-        "invalid_size",
-        [
-            "0",  # Zero dimension
-            "-32",  # Negative
-            "32x0",  # Zero height
-            "32x-16",  # Negative height
-            "32x64x128",  # Too many dimensions
-            "abc",  # Non-numeric
-            "32xabc",  # Invalid height
-            "",  # Empty
-        ],
-    )
-    def test_invalid_size_formats(self, invalid_size: str) -> None:
+        for size_str, expected in self.VALID:
+            assert parse_size_arg(size_str) == expected, size_str
+
+    def test_invalid_size_formats(self) -> None:
         """Test that invalid formats raise ValueError."""
-        with pytest.raises(ValueError):
-            parse_size_arg(invalid_size)
+        for invalid_size in self.INVALID:
+            try:
+                parse_size_arg(invalid_size)
+            except ValueError:
+                continue
+            pytest.fail(f"parse_size_arg accepted invalid size {invalid_size!r}")
 
 
 class TestLoadIcoFrames:
@@ -63,6 +67,11 @@ class TestLoadIcoFrames:
         assert len(sizes) >= 1
         assert (48, 48) in sizes
 
+    def test_sizes_sorted_not_in_file_order(self, multi_size_ico: Path) -> None:
+        """Test that sizes come back smallest first, not in ICO directory order."""
+        # The fixture's directory lists 128, 64, 32, 16.
+        assert load_ico_frames(multi_size_ico) == [(16, 16), (32, 32), (64, 64), (128, 128)]
+
     def test_nonexistent_file_raises_error(self, tmp_path: Path) -> None:
         """Test that missing file raises FileNotFoundError."""
         with pytest.raises(FileNotFoundError):
@@ -75,6 +84,16 @@ class TestLoadIcoFrames:
         with pytest.raises((OSError, ValueError)):  # PIL raises OSError or ValueError
             load_ico_frames(invalid)
 
+    def test_rewritten_file_is_reloaded(self, tmp_path: Path) -> None:
+        """Test that the size cache is invalidated when the file changes."""
+        ico = tmp_path / "changing.ico"
+        Image.new("RGBA", (32, 32)).save(ico, format="ICO", sizes=[(32, 32)])
+        assert load_ico_frames(ico) == [(32, 32)]
+        Image.new("RGBA", (16, 16)).save(ico, format="ICO", sizes=[(16, 16)])
+        st = ico.stat()
+        os.utime(ico, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_ico_frames(ico) == [(16, 16)]
+
 
 class TestOpenIcoAtSize:
     """Test opening ICO at specific size."""
@@ -104,3 +123,11 @@ class TestOpenIcoAtSize:
         img = open_ico_at_size(non_square_ico, target_size)
         assert img.size == target_size
         assert img.mode == "RGBA"
+
+    def test_repeated_open_returns_independent_images(self, multi_size_ico: Path) -> None:
+        """Test that cached decodes are not shared between returned images."""
+        first = open_ico_at_size(multi_size_ico, (16, 16))
+        first.paste((0, 0, 0, 0), (0, 0, 16, 16))
+        second = open_ico_at_size(multi_size_ico, (16, 16))
+        assert second is not first
+        assert second.getpixel((0, 0)) != (0, 0, 0, 0)
@@ -0,0 +1,57 @@
+"""Tests for the putpixel ban enforced at collection time."""
+
+import pytest
+
+from tests._pixel_ban import banned_calls
+
+
+class TestBannedCalls:
+    """Test detection of banned calls in source code."""
+
+    def test_ignores_comments_and_strings(self) -> None:
+        """Test that only call expressions are reported."""
+        source = '''"""Avoid img.putpixel(...) here."""
+# putpixel(
+note = "putpixel("
+'''
+        assert list(banned_calls(source)) == []
+
+    def test_reports_method_calls(self) -> None:
+        """Test that attribute and bare-name calls are reported with line numbers."""
+        source = "img = make()\nimg.putpixel((0, 0), 1)\nputpixel(img)\n"
+        assert list(banned_calls(source)) == [(2, "putpixel"), (3, "putpixel")]
+
+
+class TestCollectionHook:
+    """Test the plugin end to end in an isolated pytest run."""
+
+    def test_violating_test_module_fails_collection(self, pytester: pytest.Pytester) -> None:
+        """Test that a test module calling putpixel aborts the run."""
+        pytester.makepyfile(
+            test_bad="""
+            from PIL import Image
+
+            def test_pixels():
+                Image.new("RGBA", (1, 1)).putpixel((0, 0), (0, 0, 0, 0))
+            """
+        )
+        result = pytester.runpytest("-p", "tests._pixel_ban")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(
+            ["*Per-pixel image construction*", "*test_bad.py:4: putpixel()"]
+        )
+
+    def test_helper_module_in_test_package_is_scanned(self, pytester: pytest.Pytester) -> None:
+        """Test that non-test helpers next to collected tests are checked too."""
+        pkg = pytester.mkpydir("pkg")
+        (pkg / "helper.py").write_text("def paint(img):\n    img.putpixel((0, 0), 1)\n")
+        (pkg / "test_ok.py").write_text("def test_ok():\n    pass\n")
+        result = pytester.runpytest("-p", "tests._pixel_ban")
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(["*helper.py:2: putpixel()"])
+
+    def test_clean_module_passes(self, pytester: pytest.Pytester) -> None:
+        """Test that mentioning putpixel outside a call does not fail collection."""
+        pytester.makepyfile(test_ok='"""No putpixel( calls here."""\n\ndef test_ok():\n    pass\n')
+        result = pytester.runpytest("-p", "tests._pixel_ban")
+        result.assert_outcomes(passed=1)
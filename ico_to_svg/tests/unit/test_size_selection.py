@@ -1,44 +1,70 @@
 """Unit tests for ICO size selection algorithm."""
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 from ico_to_svg.ico_parser import select_size
 
+_dims = st.integers(min_value=1, max_value=512)
+_sizes = st.tuples(_dims, _dims)
+
 
 class TestSizeSelection:
     """Test size selection algorithm: exact → nearest larger → largest."""
 
-    @pytest.mark.parametrize(
-        "available,desired,expected",
-        [
-            # Exact match
-            ([(16, 16), (32, 32), (64, 64)], (32, 32), (32, 32)),
-            ([(16, 16), (48, 48), (128, 128)], (48, 48), (48, 48)),
-            # Nearest larger (prefer square)
-            ([(16, 16), (48, 48), (64, 64)], (40, 40), (48, 48)),
-            # Nearest larger (prefer smallest area when multiple larger)
-            ([(32, 32), (64, 64), (128, 128)], (50, 50), (64, 64)),
-            # Fallback to largest when no larger available
-            ([(16, 16), (32, 32)], (64, 64), (32, 32)),
-            ([(16, 16), (32, 32), (48, 48)], (100, 100), (48, 48)),
-            # Non-square: prefer square on tie
-            ([(32, 16), (32, 32)], (24, 24), (32, 32)),
-            # Multiple candidates: prefer lower area
-            ([(40, 40), (50, 30), (60, 60)], (35, 35), (40, 40)),
-            # No desired size: return largest
-            ([(16, 16), (32, 32), (64, 64)], None, (64, 64)),
-            ([(48, 48), (16, 16), (128, 128), (32, 32)], None, (128, 128)),
-        ],
-    )
-    def test_size_selection_rules(
-        self,
-        available: list[tuple[int, int]],
-        desired: tuple[int, int] | None,
-        expected: tuple[int, int],
-    ) -> None:
+    # (available, desired, expected), checked in one test item.
+    CASES: list[tuple[list[tuple[int, int]], tuple[int, int] | None, tuple[int, int]]] = [
+        # Exact match
+        ([(16, 16), (32, 32), (64, 64)], (32, 32), (32, 32)),
+        ([(16, 16), (48, 48), (128, 128)], (48, 48), (48, 48)),
+        # Nearest larger (prefer square)
+        ([(16, 16), (48, 48), (64, 64)], (40, 40), (48, 48)),
+        # Nearest larger (prefer smallest area when multiple larger)
+        ([(32, 32), (64, 64), (128, 128)], (50, 50), (64, 64)),
+        # Fallback to largest when no larger available
+        ([(16, 16), (32, 32)], (64, 64), (32, 32)),
+        ([(16, 16), (32, 32), (48, 48)], (100, 100), (48, 48)),
+        # Non-square: prefer square on tie
+        ([(32, 16), (32, 32)], (24, 24), (32, 32)),
+        # Multiple candidates: prefer lower area
+        ([(40, 40), (50, 30), (60, 60)], (35, 35), (40, 40)),
+        # No desired size: return largest
+        ([(16, 16), (32, 32), (64, 64)], None, (64, 64)),
+        ([(48, 48), (16, 16), (128, 128), (32, 32)], None, (128, 128)),
+    ]
+
+    def test_size_selection_table(self) -> None:
         """Test size selection priority rules."""
+        for available, desired, expected in self.CASES:
+            assert select_size(available, desired) == expected, (available, desired)
+
+    @given(available=st.lists(_sizes, min_size=1, max_size=8), desired=st.none() | _sizes)
+    def test_size_selection_properties(
+        self, available: list[tuple[int, int]], desired: tuple[int, int] | None
+    ) -> None:
+        """Test invariants of the selection rules on random size lists."""
         result = select_size(available, desired)
-        assert result == expected
+        assert result in available
+        # Order of frames in the ICO never matters
+        assert select_size(list(reversed(available)), desired) == result
+        assert select_size(set(available), desired) == result
+
+        largest = max(w * h for w, h in available)
+        if desired is None:
+            assert result[0] * result[1] == largest
+        elif desired in available:
+            assert result == desired
+        else:
+            covering = [s for s in available if s[0] >= desired[0] and s[1] >= desired[1]]
+            if not covering:
+                assert result[0] * result[1] == largest
+            else:
+                assert result in covering
+                # A size too narrow for the request never changes the choice
+                if desired[0] > 1:
+                    narrow = (desired[0] - 1, desired[1])
+                    assert select_size([*available, narrow], desired) == result
 
     def test_no_sizes_raises_error(self) -> None:
         """Test that empty size list raises ValueError."""
@@ -59,3 +85,10 @@ class TestSizeSelection:
         assert select_size([(32, 64)], (40, 40)) == (32, 64)
         # Nearest larger with mixed aspect ratios
         assert select_size([(16, 32), (32, 32), (64, 32)], (24, 24)) == (32, 32)
+
+    def test_accepts_set_of_sizes(self) -> None:
+        """Test that a set of sizes gives the same results as a list."""
+        available = {(16, 16), (32, 32), (64, 64)}
+        assert select_size(available, (32, 32)) == (32, 32)
+        assert select_size(available, (40, 40)) == (64, 64)
+        assert select_size(available, None) == (64, 64)
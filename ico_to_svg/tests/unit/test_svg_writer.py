@@ -1,56 +1,253 @@
 """Unit tests for SVG generation functions."""
 
+import base64
+import io
+import re
+from collections import OrderedDict
 from pathlib import Path
 
+import numpy as np
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from hypothesis.extra.numpy import arrays
 from PIL import Image
 
-from ico_to_svg.svg_writer import Run, runs_to_path_d, vectorize, write_svg_raster, write_svg_vector
+from ico_to_svg import svg_writer
+from ico_to_svg.svg_writer import (
+    Run,
+    RunArrays,
+    _find_runs_numpy,
+    runs_to_path_d,
+    vectorize,
+    write_svg_raster,
+    write_svg_vector,
+)
+from tests._imgutil import make_rgba
+from tests._reference_vectorize import vectorize_reference
+
+# Few distinct byte values, so neighbouring pixels often share a color (runs
+# longer than one pixel) and alphas land on both sides of typical thresholds.
+_rgba_arrays = arrays(
+    np.uint8,
+    st.tuples(st.integers(1, 16), st.integers(1, 16), st.just(4)),
+    elements=st.sampled_from([0, 1, 127, 128, 254, 255]),
+)
+
+
+def _reconstruct(
+    color_runs: dict[tuple[int, int, int, int], RunArrays], w: int, h: int
+) -> np.ndarray:
+    """Paint vectorize() runs back onto a transparent (h, w, 4) canvas."""
+    canvas = np.zeros((h, w, 4), dtype=np.uint8)
+    for color, runs in color_runs.items():
+        for y, x1, x2 in runs.cols.tolist():
+            canvas[y, x1 : x2 + 1] = color
+    return canvas
+
+
+def _assert_contains(content: str, *required: str) -> None:
+    """Assert every required substring is present, reporting all that are missing."""
+    missing = [s for s in required if s not in content]
+    assert not missing, missing
+
+
+@pytest.fixture(scope="module")
+def solid_images() -> dict[tuple[tuple[int, int], tuple[int, ...]], Image.Image]:
+    """Module-wide cache of solid RGBA images keyed by ``(size, fill)``.
+
+    Returns
+    -------
+    Dict
+        Initially empty; tests build an image only when its key is missing
+        and must not mutate it (``.copy()`` first if needed).
+    """
+    return {}
+
+
+@pytest.fixture(scope="module")
+def red_16_img() -> Image.Image:
+    """Opaque 16x16 red image shared by the module; do not mutate."""
+    return Image.new("RGBA", (16, 16), (255, 0, 0, 255))
+
+
+@pytest.fixture(scope="module")
+def semi_red_16_img() -> Image.Image:
+    """Half-transparent 16x16 red image shared by the module; do not mutate."""
+    return Image.new("RGBA", (16, 16), (255, 0, 0, 128))
+
+
+@pytest.fixture(scope="class")
+def out_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Output directory shared by a test class; tests use distinct file names."""
+    return tmp_path_factory.mktemp("svg_writer")
+
+
+@pytest.fixture(scope="class")
+def red_16_svg(red_16_img: Image.Image) -> str:
+    """Raster SVG for ``red_16_img``, PNG-encoded once per test class."""
+    buf = io.StringIO()
+    write_svg_raster(red_16_img, buf)
+    return buf.getvalue()
+
+
+@pytest.fixture(scope="class")
+def red_16_b64(red_16_svg: str) -> str:
+    """Base64 PNG payload embedded in ``red_16_svg``."""
+    match = re.search(r"base64,([^']+)'", red_16_svg)
+    assert match is not None
+    return match.group(1)
 
 
 class TestVectorize:
     """Test image vectorization into color runs."""
 
-    def test_solid_color_image(self) -> None:
-        """Test vectorizing a solid color image."""
-        img = Image.new("RGBA", (4, 2), (255, 0, 0, 255))
-        color_runs, w, h = vectorize(img, alpha_threshold=128)
-        assert w == 4
-        assert h == 2
-        assert len(color_runs) == 1
-        assert (255, 0, 0, 255) in color_runs
-        # Should have 2 rows, each with 1 run of 4 pixels
-        assert len(color_runs[(255, 0, 0, 255)]) == 2
-
-    def test_transparent_pixels_ignored(self) -> None:
-        """Test that transparent pixels are skipped."""
-        img = Image.new("RGBA", (4, 1), (255, 0, 0, 0))  # Fully transparent
-        color_runs, w, h = vectorize(img, alpha_threshold=128)
-        assert w == 4
-        assert h == 1
-        assert len(color_runs) == 0  # No runs for transparent pixels
-
-    def test_alpha_threshold_effect(self) -> None:
-        """Test alpha threshold filtering."""
-        img = Image.new("RGBA", (2, 1), (255, 0, 0, 100))  # Semi-transparent
-        # Threshold 128: should be ignored
-        color_runs_high, _, _ = vectorize(img, alpha_threshold=128)
-        assert len(color_runs_high) == 0
-        # Threshold 50: should be included
-        color_runs_low, _, _ = vectorize(img, alpha_threshold=50)
-        assert len(color_runs_low) == 1
+    @pytest.mark.parametrize(
+        "size,fill,threshold,n_colors",
+        [
+            ((4, 2), (255, 0, 0, 255), 128, 1),  # Solid color
+            ((4, 1), (255, 0, 0, 0), 128, 0),  # Fully transparent pixels skipped
+            ((2, 1), (255, 0, 0, 100), 128, 0),  # Semi-transparent below threshold
+            ((2, 1), (255, 0, 0, 100), 50, 1),  # Semi-transparent above threshold
+        ],
+    )
+    def test_solid_fill(
+        self,
+        solid_images: dict[tuple[tuple[int, int], tuple[int, ...]], Image.Image],
+        size: tuple[int, int],
+        fill: tuple[int, int, int, int],
+        threshold: int,
+        n_colors: int,
+    ) -> None:
+        """Test vectorizing solid images across alpha and threshold combinations."""
+        # vectorize() only reads the image, so cases share the cached instance
+        key = (size, fill)
+        if key not in solid_images:
+            solid_images[key] = Image.new("RGBA", size, fill)
+        img = solid_images[key]
+        color_runs, w, h = vectorize(img, alpha_threshold=threshold)
+        assert (w, h) == size
+        assert len(color_runs) == n_colors
+        if n_colors:
+            # One run spanning each row, normalized to opaque
+            assert [list(runs) for runs in color_runs.values()] == [
+                [Run(y, 0, w - 1) for y in range(h)]
+            ]
+            assert (*fill[:3], 255) in color_runs
 
     def test_multiple_colors(self) -> None:
         """Test vectorizing image with multiple colors."""
-        img = Image.new("RGBA", (4, 1))
-        img.putpixel((0, 0), (255, 0, 0, 255))
-        img.putpixel((1, 0), (255, 0, 0, 255))
-        img.putpixel((2, 0), (0, 255, 0, 255))
-        img.putpixel((3, 0), (0, 255, 0, 255))
+        img = make_rgba([[(255, 0, 0, 255), (255, 0, 0, 255), (0, 255, 0, 255), (0, 255, 0, 255)]])
         color_runs, _, _ = vectorize(img, alpha_threshold=128)
         assert len(color_runs) == 2
         assert (255, 0, 0, 255) in color_runs
         assert (0, 255, 0, 255) in color_runs
 
+    def test_runs_stored_as_compact_array(self) -> None:
+        """Test that runs of one color share a single (N, 3) int16 array."""
+        img = Image.new("RGBA", (4, 2), (255, 0, 0, 255))
+        color_runs, _, _ = vectorize(img, alpha_threshold=128)
+        runs = color_runs[(255, 0, 0, 255)]
+        assert runs.cols.shape == (2, 3)
+        assert runs.cols.dtype == np.int16
+        assert list(runs) == [Run(0, 0, 3), Run(1, 0, 3)]
+
+    @given(arr=_rgba_arrays, threshold=st.integers(0, 255))
+    def test_vectorize_roundtrip(self, arr: np.ndarray, threshold: int) -> None:
+        """Test that painting the runs back reproduces every opaque pixel and nothing else."""
+        color_runs, w, h = vectorize(make_rgba(arr), alpha_threshold=threshold)
+        recon = _reconstruct(color_runs, w, h)
+        opaque = arr[..., 3] >= threshold
+        assert np.array_equal(recon[..., 3] == 255, opaque)
+        assert np.array_equal(recon[..., :3][opaque], arr[..., :3][opaque])
+
+    def test_run_has_no_instance_dict(self) -> None:
+        """Test that Run objects are slotted rather than dict-backed."""
+        assert not hasattr(Run(0, 0, 3), "__dict__")
+
+    def test_matches_python_reference(self) -> None:
+        """Test that vectorize agrees with the pure-Python reference on noisy images."""
+        rng = np.random.default_rng(0)
+        for threshold in (0, 100, 255):
+            arr = (rng.integers(0, 3, (12, 9, 4)) * 120).astype(np.uint8)
+            img = Image.fromarray(arr)
+            fast, w, h = vectorize(img, alpha_threshold=threshold)
+            ref, ref_w, ref_h = vectorize_reference(img, alpha_threshold=threshold)
+            assert (w, h) == (ref_w, ref_h)
+            assert list(fast) == list(ref)
+            assert {color: list(runs) for color, runs in fast.items()} == ref
+
+    def test_reference_matches_hand_computed_runs(self) -> None:
+        """Test the oracle itself, so it cannot drift along with vectorize."""
+        red, blue, clear = (255, 0, 0, 255), (0, 0, 255, 255), (0, 0, 0, 0)
+        img = make_rgba([[red, red, blue, clear], [clear, blue, blue, red]])
+        color_runs, w, h = vectorize_reference(img, alpha_threshold=128)
+        assert (w, h) == (4, 2)
+        assert color_runs == {
+            red: [Run(0, 0, 1), Run(1, 3, 3)],
+            blue: [Run(0, 2, 2), Run(1, 1, 2)],
+        }
+
+    def test_matches_reference_on_full_size_frame(self) -> None:
+        """Test vectorize end to end against the reference on a 256x256 noisy image."""
+        rng = np.random.default_rng(2)
+        img = Image.fromarray((rng.integers(0, 3, (256, 256, 4)) * 120).astype(np.uint8))
+        fast, _, _ = vectorize(img, alpha_threshold=100)
+        ref, _, _ = vectorize_reference(img, alpha_threshold=100)
+        assert list(fast) == list(ref)
+        assert {color: list(runs) for color, runs in fast.items()} == ref
+
+    def test_numpy_runs_pack_colors_as_rgb(self) -> None:
+        """Test the uint32 view yields 0xRRGGBB colors regardless of byte order."""
+        arr = np.array([[[1, 2, 3, 255], [1, 2, 3, 255], [4, 5, 6, 10]]], dtype=np.uint8)
+        ys, x1s, x2s, colors = _find_runs_numpy(arr, 16)
+        assert ys.tolist() == [0]
+        assert (x1s.tolist(), x2s.tolist()) == ([0], [1])
+        assert colors.tolist() == [0x010203]
+
+
+class TestRunArrays:
+    """Test the array-backed run sequence returned by vectorize()."""
+
+    def test_indexing_and_slicing(self) -> None:
+        """Test integer indexes return Run objects and slices return RunArrays."""
+        runs = RunArrays.from_runs([Run(0, 0, 3), Run(1, 2, 5), Run(2, 1, 1)])
+        assert runs[0] == Run(0, 0, 3)
+        assert runs[-1] == Run(2, 1, 1)
+        assert isinstance(runs[:2], RunArrays)
+        assert list(runs[:2]) == [Run(0, 0, 3), Run(1, 2, 5)]
+        assert Run(1, 2, 5) in runs
+        with pytest.raises(IndexError):
+            runs[3]
+
+    def test_equality_compares_runs(self) -> None:
+        """Test equality by content rather than raising on array truthiness."""
+        a = RunArrays.from_runs([Run(0, 0, 3), Run(1, 2, 5)])
+        b = RunArrays.from_runs([Run(0, 0, 3), Run(1, 2, 5)])
+        assert a == b
+        assert a != b[:1]
+        assert a != [Run(0, 0, 3), Run(1, 2, 5)]
+
+    def test_compaction_boundary(self) -> None:
+        """Test the int16/int32 switch keeps indexing, equality and x2 + 1 exact."""
+        small = RunArrays.from_runs([Run(0, 0, 32766)])
+        large = RunArrays.from_runs([Run(0, 0, 32767)])
+        assert small.cols.dtype == np.int16
+        assert large.cols.dtype == np.int32
+        assert small[0] == Run(0, 0, 32766)
+        assert type(large[0].x2) is int
+        assert RunArrays(small.cols.astype(np.int32)) == small
+        assert runs_to_path_d(small) == "M0,0H32767V1H0Z"
+        assert runs_to_path_d(large) == "M0,0H32768V1H0Z"
+
+    def test_negative_coordinates_do_not_wrap(self) -> None:
+        """Test that coordinates below the int16 range widen to int32 instead of wrapping."""
+        low = RunArrays.from_runs([Run(-32768, 0, 1)])
+        lower = RunArrays.from_runs([Run(-32769, 0, 1)])
+        assert low.cols.dtype == np.int16
+        assert lower.cols.dtype == np.int32
+        assert lower[0] == Run(-32769, 0, 1)
+
 
 class TestRunsToPathD:
     """Test SVG path data generation from runs."""
@@ -77,72 +274,176 @@ class TestRunsToPathD:
         path_d = runs_to_path_d([])
         assert path_d == ""
 
+    def test_coordinates_beyond_icon_range(self) -> None:
+        """Test path data for runs outside the pre-rendered coordinate table."""
+        assert runs_to_path_d([Run(600, 700, 800), Run(1, 2, 3)]) == (
+            "M700,600H801V601H700Z M2,1H4V2H2Z"
+        )
+
+    def test_negative_coordinates_not_table_indexed(self) -> None:
+        """Test negative coordinates are formatted, not looked up from the table's end."""
+        assert runs_to_path_d([Run(0, -1, 2)]) == "M-1,0H3V1H-1Z"
+        assert runs_to_path_d([Run(-2, 0, 1)]) == "M0,-2H2V-1H0Z"
+
+    @pytest.mark.parametrize("width", [100, 1000])  # table lookup and % formatting paths
+    def test_many_runs_grow_linearly(self, width: int) -> None:
+        """Test that path data for N runs is exactly N rectangle commands."""
+        runs = [Run(i // width, i % width, i % width) for i in range(10000)]
+        path_d = runs_to_path_d(runs)
+        half = runs_to_path_d(runs[:5000])
+        assert path_d.count("Z") == 10000
+        assert path_d.startswith(half + " ")
+        assert path_d == " ".join(runs_to_path_d([run]) for run in runs)
+
 
 class TestWriteSvgRaster:
     """Test raster SVG writing."""
 
-    def test_write_basic_raster_svg(self, tmp_path: Path) -> None:
+    def test_write_basic_raster_svg(self, red_16_svg: str, red_16_b64: str) -> None:
         """Test writing basic raster SVG."""
-        img = Image.new("RGBA", (16, 16), (255, 0, 0, 255))
-        output = tmp_path / "test.svg"
-        write_svg_raster(img, output)
-        assert output.exists()
-        content = output.read_text()
-        assert "data:image/png;base64," in content
-        assert "width='16'" in content
-        assert "height='16'" in content
+        _assert_contains(
+            red_16_svg, f"data:image/png;base64,{red_16_b64}'", "width='16'", "height='16'"
+        )
 
-    def test_write_with_background(self, tmp_path: Path) -> None:
+    def test_write_with_background(self, semi_red_16_img: Image.Image) -> None:
         """Test writing raster SVG with background."""
-        img = Image.new("RGBA", (16, 16), (255, 0, 0, 128))  # Semi-transparent
-        output = tmp_path / "test_bg.svg"
-        write_svg_raster(img, output, background="#ffffff")
-        assert output.exists()
-        content = output.read_text()
-        assert "data:image/png;base64," in content
+        buf = io.StringIO()
+        write_svg_raster(semi_red_16_img, buf, background="#ffffff")
+        assert "data:image/png;base64," in buf.getvalue()
 
-    def test_write_transparent_background(self, tmp_path: Path) -> None:
+    def test_write_transparent_background(self, red_16_img: Image.Image, red_16_b64: str) -> None:
         """Test writing with explicit transparent background."""
-        img = Image.new("RGBA", (16, 16), (255, 0, 0, 255))
-        output = tmp_path / "test_trans.svg"
-        write_svg_raster(img, output, background="transparent")
-        assert output.exists()
+        buf = io.StringIO()
+        write_svg_raster(red_16_img, buf, background="transparent")
+        content = buf.getvalue()
+        assert red_16_b64 in content
+        assert content.endswith("</svg>\n")
+
+    def test_stream_output_left_open(self, semi_red_16_img: Image.Image, out_dir: Path) -> None:
+        """Test that a caller's stream is not closed and matches file output."""
+        buf = io.StringIO()
+        write_svg_raster(semi_red_16_img, buf)
+        assert not buf.closed
+        output = out_dir / "test.svg"
+        write_svg_raster(semi_red_16_img, output)
+        assert output.read_text() == buf.getvalue()
+
+    def test_repeat_render_uses_matching_payload(
+        self, semi_red_16_img: Image.Image, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that identical renders hit the PNG cache and backgrounds do not."""
+        monkeypatch.setattr(svg_writer, "_png_cache", OrderedDict())
+        encode = svg_writer._encode_png
+        calls: list[str | None] = []
+
+        def counting_encode(image: Image.Image, background: str | None, level: int) -> bytes:
+            calls.append(background)
+            return encode(image, background, level)
+
+        monkeypatch.setattr(svg_writer, "_encode_png", counting_encode)
+        first, second, with_bg = io.StringIO(), io.StringIO(), io.StringIO()
+        write_svg_raster(semi_red_16_img, first)
+        write_svg_raster(semi_red_16_img.copy(), second)
+        assert len(calls) == 1
+        assert first.getvalue() == second.getvalue()
+        write_svg_raster(semi_red_16_img, with_bg, background="#ffffff")
+        assert len(calls) == 2
+        assert first.getvalue() != with_bg.getvalue()
+
+    def test_palette_images_do_not_share_cache_entry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that "P" images with equal index bytes but different palettes differ."""
+        monkeypatch.setattr(svg_writer, "_png_cache", OrderedDict())
+        red = Image.new("P", (4, 4), 0)
+        red.putpalette([255, 0, 0])
+        blue = Image.new("P", (4, 4), 0)
+        blue.putpalette([0, 0, 255])
+        assert red.tobytes() == blue.tobytes()
+        colors = []
+        for img in (red, blue):
+            buf = io.StringIO()
+            write_svg_raster(img, buf)
+            b64 = re.search(r"base64,([^']+)'", buf.getvalue())
+            assert b64 is not None
+            png = Image.open(io.BytesIO(base64.b64decode(b64.group(1))))
+            colors.append(png.convert("RGB").getpixel((0, 0)))
+        assert colors == [(255, 0, 0), (0, 0, 255)]
+
+    def test_opaque_image_embedded_as_rgb(self, red_16_b64: str) -> None:
+        """Test that fully opaque images drop the alpha channel in the PNG."""
+        png = Image.open(io.BytesIO(base64.b64decode(red_16_b64)))
+        assert png.mode == "RGB"
+        assert png.getpixel((0, 0)) == (255, 0, 0)
+
+    def test_background_blend_matches_pillow(self, out_dir: Path) -> None:
+        """Test the NumPy background blend against Pillow's alpha_composite."""
+        rng = np.random.default_rng(0)
+        img = Image.fromarray(rng.integers(0, 256, (16, 16, 4), dtype=np.uint8))
+        expected = Image.new("RGBA", img.size, "#0a64c8")
+        expected.alpha_composite(img)
+        output = out_dir / "blend.svg"
+        write_svg_raster(img, output, background="#0a64c8", embed="sidecar")
+        with Image.open(out_dir / "blend.png") as png:
+            assert png.mode == "RGB"
+            assert png.tobytes() == expected.convert("RGB").tobytes()
+
+    def test_sidecar_embed_links_png(self, semi_red_16_img: Image.Image, out_dir: Path) -> None:
+        """Test sidecar mode writes a PNG next to the SVG and links it."""
+        output = out_dir / "linked.svg"
+        write_svg_raster(semi_red_16_img, output, embed="sidecar")
+        content = output.read_text()
+        assert "href='linked.png'" in content
+        assert "base64" not in content
+        with Image.open(out_dir / "linked.png") as png:
+            assert png.size == (16, 16)
+
+    def test_sidecar_requires_path(self, red_16_img: Image.Image) -> None:
+        """Test that sidecar mode rejects stream output."""
+        with pytest.raises(ValueError, match="sidecar"):
+            write_svg_raster(red_16_img, io.StringIO(), embed="sidecar")
+
+    @pytest.mark.parametrize("name", ["icon.png", "icon.PNG"])
+    def test_sidecar_rejects_png_output(
+        self, red_16_img: Image.Image, out_dir: Path, name: str
+    ) -> None:
+        """Test that sidecar mode refuses an output path its PNG would overwrite."""
+        output = out_dir / name
+        with pytest.raises(ValueError, match=r"\.png"):
+            write_svg_raster(red_16_img, output, embed="sidecar")
+        assert not output.exists()
+
+    def test_invalid_compress_level_raises(self, red_16_img: Image.Image) -> None:
+        """Test that out-of-range compression levels are rejected."""
+        with pytest.raises(ValueError, match="compress_level"):
+            write_svg_raster(red_16_img, io.StringIO(), compress_level=10)
 
 
 class TestWriteSvgVector:
     """Test vector SVG writing."""
 
-    def test_write_basic_vector_svg(self, tmp_path: Path) -> None:
+    def test_write_basic_vector_svg(self) -> None:
         """Test writing basic vector SVG."""
         runs = {(255, 0, 0, 255): [Run(0, 0, 15)]}
-        output = tmp_path / "test_vec.svg"
-        write_svg_vector(runs, 16, 16, output)
-        assert output.exists()
-        content = output.read_text()
-        assert "<svg" in content
-        assert "<path" in content
-        assert "#ff0000" in content
+        buf = io.StringIO()
+        write_svg_vector(runs, 16, 16, buf)
+        content = buf.getvalue()
+        _assert_contains(content, "<svg", "<path", "#ff0000")
 
-    def test_write_with_background(self, tmp_path: Path) -> None:
+    def test_write_with_background(self) -> None:
         """Test writing vector SVG with background."""
         runs = {(0, 0, 255, 255): [Run(0, 0, 7)]}
-        output = tmp_path / "test_vec_bg.svg"
-        write_svg_vector(runs, 8, 8, output, background="#ffffff")
-        assert output.exists()
-        content = output.read_text()
-        assert "<rect" in content  # Background rect
-        assert "#ffffff" in content
-
-    def test_write_multiple_colors(self, tmp_path: Path) -> None:
-        """Test writing vector SVG with multiple colors."""
-        runs = {
-            (255, 0, 0, 255): [Run(0, 0, 3)],
-            (0, 255, 0, 255): [Run(1, 0, 3)],
-        }
-        output = tmp_path / "test_multi.svg"
-        write_svg_vector(runs, 4, 2, output)
-        assert output.exists()
-        content = output.read_text()
-        assert "#ff0000" in content
-        assert "#00ff00" in content
-        assert content.count("<path") == 2
+        buf = io.StringIO()
+        write_svg_vector(runs, 8, 8, buf, background="#ffffff")
+        content = buf.getvalue()
+        _assert_contains(content, "<rect", "#ffffff")  # Background rect
+
+    @pytest.mark.parametrize("n_colors", [1, 2, 8, 64, 256])
+    def test_write_multiple_colors(self, n_colors: int) -> None:
+        """Test one path per color, with output size linear in the color count."""
+        runs = {(i, 0, 0, 255): [Run(i, 0, 3)] for i in range(n_colors)}
+        buf = io.StringIO()
+        write_svg_vector(runs, 4, n_colors, buf)
+        content = buf.getvalue()
+        assert content.count("<path") == n_colors
+        assert f'fill="#{n_colors - 1:02x}0000"' in content
+        # Header plus under 80 characters per color path.
+        assert len(content) < 200 + 80 * n_colors
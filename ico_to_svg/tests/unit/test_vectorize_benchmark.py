@@ -0,0 +1,42 @@
+"""Micro-benchmarks for vectorize on a full-size 256x256 icon frame.
+
+Requires pytest-benchmark (part of the ``dev`` extra); skipped without it.
+CI deselects these with ``-m "not benchmark"``; run them locally with::
+
+    pytest tests/unit/test_vectorize_benchmark.py --benchmark-only
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ico_to_svg.svg_writer import vectorize
+from tests._reference_vectorize import vectorize_reference
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark(group="vectorize")
+
+
+@pytest.fixture(scope="module")
+def icon_256() -> Image.Image:
+    """Opaque 256x256 frame with 16 gray levels in random noise."""
+    levels = np.random.default_rng(0).integers(0, 16, (256, 256), dtype=np.uint8) * 16
+    rgba = np.stack([levels] * 3 + [np.full_like(levels, 255)], axis=-1)
+    return Image.fromarray(rgba, "RGBA")
+
+
+class TestVectorizeBenchmark:
+    """Benchmark the pure-Python reference against the NumPy implementation."""
+
+    @pytest.mark.parametrize("impl", ["python", "numpy"])
+    def test_bench_vectorize(
+        self, benchmark: Callable[..., Any], icon_256: Image.Image, impl: str
+    ) -> None:
+        """Benchmark one vectorize implementation on the 256x256 frame."""
+        func = vectorize_reference if impl == "python" else vectorize
+        color_runs, _, _ = benchmark(func, icon_256, 128)
+        assert len(color_runs) == 16